@@ -0,0 +1,75 @@
+# app/auth/api_keys.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app.config import Settings, settings
+from app.metrics import cache_hit, cache_miss
+from app.schemas.api_key import ApiKeyPrincipal
+
+
+class VerifiedKeyCache:
+    """
+    Per-worker LRU cache of verified API keys, keyed by key digest.
+
+    A hit skips the database entirely, so a machine request costs one SHA-256
+    and a dict lookup. Entries expire after ``ttl`` seconds, which bounds how
+    long a key revoked through another worker keeps working here.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.API_KEY_CACHE_TTL_SECONDS,
+        max_size: int = settings.API_KEY_CACHE_MAX_SIZE,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, ApiKeyPrincipal]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``API_KEY_CACHE_*`` settings, emptying the cache."""
+        with self._lock:
+            self.ttl = app_settings.API_KEY_CACHE_TTL_SECONDS
+            self.max_size = app_settings.API_KEY_CACHE_MAX_SIZE
+            self._entries.clear()
+
+    def get(self, digest: str) -> Optional[ApiKeyPrincipal]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                cache_miss("api_key")
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            cache_hit("api_key")
+            return entry[1]
+
+    def put(self, digest: str, principal: ApiKeyPrincipal) -> None:
+        with self._lock:
+            self._entries[digest] = (time.monotonic() + self.ttl, principal)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_key(self, key_id: UUID) -> None:
+        """Drop a revoked key from this worker's cache."""
+        with self._lock:
+            for digest in [d for d, (_, p) in self._entries.items() if p.key_id == key_id]:
+                del self._entries[digest]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+api_key_cache = VerifiedKeyCache()
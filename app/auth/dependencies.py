@@ -1,13 +1,22 @@
 # app/auth/dependencies.py
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from typing import Optional
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Security, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from app.auth.api_keys import api_key_cache
 from app.database import get_db
+from app.models.api_key import ApiKey, hash_api_key
 from app.models.user import User
+from app.schemas.api_key import ApiKeyPrincipal
 from app.schemas.user import UserResponse
+from app.tracing import tracer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login", auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -20,15 +29,18 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    user_id = User.verify_token(token)
+    with tracer.span("jwt.verify"):
+        user_id = User.verify_token(token, db)
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    with tracer.span("db.user_lookup"):
+        user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
         
-    return UserResponse.model_validate(user)  # Updated from from_orm
+    with tracer.span("validate.user_response"):
+        return UserResponse.model_validate(user)  # Updated from from_orm
 
 def get_current_active_user(
     current_user: UserResponse = Depends(get_current_user)
@@ -40,3 +52,79 @@ def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+
+def authenticate_api_key(db: Session, raw_key: str) -> Optional[ApiKeyPrincipal]:
+    """Resolve a raw API key to a principal, consulting the verified-key cache first."""
+    digest = hash_api_key(raw_key)
+    principal = api_key_cache.get(digest)
+    if principal is not None:
+        return principal
+
+    verified = ApiKey.verify(db, raw_key)
+    if verified is None:
+        return None
+    api_key, owner_is_active = verified
+    if not owner_is_active:
+        return None
+
+    principal = ApiKeyPrincipal(
+        key_id=api_key.id,
+        user_id=api_key.user_id,
+        scopes=frozenset(api_key.scope_list),
+    )
+    api_key_cache.put(digest, principal)
+    return principal
+
+def api_key_scope(scope: str):
+    """Build a dependency that authenticates the X-API-Key header and checks ``scope``."""
+    def dependency(
+        raw_key: Optional[str] = Security(api_key_header),
+        db: Session = Depends(get_db)
+    ) -> ApiKeyPrincipal:
+        if not raw_key:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="API key required",
+            )
+
+        principal = authenticate_api_key(db, raw_key)
+        if principal is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid API key",
+            )
+        if scope not in principal.scopes:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"API key lacks scope: {scope}",
+            )
+        return principal
+
+    return dependency
+
+def api_key_or_user(scope: str):
+    """
+    Build a dependency that identifies the caller by API key or bearer token,
+    when either is sent, and returns the id of the user the request acts for.
+
+    Neither is required: anonymous requests get ``None`` and are served as
+    before. Credentials that are sent must be good, though. A request with
+    X-API-Key is judged on the key alone (valid, carrying ``scope``) even
+    if a bearer token comes with it; otherwise a bearer token must belong
+    to an active user.
+    """
+    check_api_key = api_key_scope(scope)
+
+    def dependency(
+        raw_key: Optional[str] = Security(api_key_header),
+        token: Optional[str] = Depends(optional_oauth2_scheme),
+        db: Session = Depends(get_db)
+    ) -> Optional[UUID]:
+        if raw_key:
+            return check_api_key(raw_key, db).user_id
+        if not token:
+            return None
+        return get_current_active_user(get_current_user(token, db)).id
+
+    return dependency
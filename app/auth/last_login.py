@@ -0,0 +1,58 @@
+# app/auth/last_login.py
+
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import DateTime, update, values, column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.config import Settings, settings
+from app.write_behind import WriteBehindBuffer
+
+
+class LastLoginBuffer(WriteBehindBuffer):
+    """
+    Write-behind queue for ``User.last_login``.
+
+    Logins only record a timestamp in memory; a background thread writes all
+    pending timestamps in a single ``UPDATE ... FROM (VALUES ...)`` at most
+    every ``flush_interval`` seconds, or sooner once ``max_pending`` logins
+    are queued. Repeated logins by the same user collapse to the latest one.
+    """
+
+    name = "last_login"
+
+    def __init__(
+        self,
+        flush_interval: float = settings.LAST_LOGIN_FLUSH_SECONDS,
+        max_pending: int = settings.LAST_LOGIN_MAX_PENDING,
+        session_factory: Optional[Callable] = None,
+    ):
+        super().__init__(flush_interval, max_pending, session_factory)
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``LAST_LOGIN_*`` settings."""
+        self.flush_interval = app_settings.LAST_LOGIN_FLUSH_SECONDS
+        self.max_pending = app_settings.LAST_LOGIN_MAX_PENDING
+
+    def record(self, user_id: UUID, when: Optional[datetime] = None) -> None:
+        """Queue a last_login timestamp for ``user_id``."""
+        self.put(user_id, when or datetime.utcnow())
+
+    def write(self, db, batch: Dict[UUID, datetime]) -> None:
+        from app.models.user import User
+
+        rows = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("last_login", DateTime()),
+            name="pending_logins",
+        ).data(list(batch.items()))
+        db.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == rows.c.id)
+            .values(last_login=rows.c.last_login)
+        )
+
+
+last_login_buffer = LastLoginBuffer()
@@ -0,0 +1,85 @@
+# app/auth/refresh_tokens.py
+
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, String, column, insert, select, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.config import Settings, settings
+from app.write_behind import WriteBehindBuffer
+
+# (id, user_id, family_id, expires_at, created_at), keyed by token_hash
+PendingToken = Tuple[uuid.UUID, uuid.UUID, uuid.UUID, datetime, datetime]
+
+
+class RefreshTokenBuffer(WriteBehindBuffer):
+    """
+    Write-behind queue for refresh tokens issued at login.
+
+    The login request only hashes a new token into memory; a background
+    thread inserts every pending token in one ``INSERT ... SELECT FROM
+    (VALUES ...)``, joined to ``users`` so a user deleted in between is
+    skipped instead of failing the batch. ``RefreshToken.rotate`` and
+    ``revoke`` flush first when the token they are given is still queued
+    here or in a batch that is being written. Another worker only sees the token after the flush, so a refresh
+    sent to it within ``flush_interval`` of the login is rejected.
+    """
+
+    name = "refresh_token"
+
+    def __init__(
+        self,
+        flush_interval: float = settings.REFRESH_TOKEN_FLUSH_SECONDS,
+        max_pending: int = settings.REFRESH_TOKEN_MAX_PENDING,
+        session_factory: Optional[Callable] = None,
+    ):
+        super().__init__(flush_interval, max_pending, session_factory)
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``REFRESH_TOKEN_FLUSH_SECONDS`` / ``REFRESH_TOKEN_MAX_PENDING``."""
+        self.flush_interval = app_settings.REFRESH_TOKEN_FLUSH_SECONDS
+        self.max_pending = app_settings.REFRESH_TOKEN_MAX_PENDING
+
+    def flush_if_pending(self, token_hash: str) -> bool:
+        """
+        Make sure ``token_hash`` is committed if it is queued; True if it was.
+
+        If the background thread is already writing it, this waits for that
+        flush to commit.
+        """
+        if not self.is_pending(token_hash):
+            return False
+        self.flush()
+        return True
+
+    def write(self, db, batch: Dict[str, PendingToken]) -> None:
+        from app.models.refresh_token import RefreshToken
+        from app.models.user import User
+
+        table = RefreshToken.__table__
+        rows = values(
+            column("token_hash", String(64)),
+            column("id", PG_UUID(as_uuid=True)),
+            column("user_id", PG_UUID(as_uuid=True)),
+            column("family_id", PG_UUID(as_uuid=True)),
+            column("expires_at", DateTime()),
+            column("created_at", DateTime()),
+            name="pending_refresh_tokens",
+        ).data([(token_hash, *row) for token_hash, row in batch.items()])
+        issued = (
+            select(
+                rows.c.id, rows.c.token_hash, rows.c.user_id, rows.c.family_id,
+                rows.c.expires_at, rows.c.created_at,
+            )
+            .join(User.__table__, User.__table__.c.id == rows.c.user_id)
+        )
+        db.execute(
+            insert(table).from_select(
+                ["id", "token_hash", "user_id", "family_id", "expires_at", "created_at"], issued,
+            )
+        )
+
+
+refresh_token_buffer = RefreshTokenBuffer()
@@ -0,0 +1,208 @@
+# app/auth/revocation.py
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from app.config import Settings, settings
+from app.metrics import cache_hit, cache_miss
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests can return false positives at roughly ``error_rate``
+    once ``capacity`` items are added, but never false negatives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class TokenRevocationList:
+    """
+    Per-worker view of revoked access-token ids.
+
+    A Bloom filter answers "definitely not revoked" without touching the
+    database; only a possible hit is confirmed against ``revoked_tokens``.
+    A background thread pulls rows revoked since the last refresh every
+    ``refresh_interval`` seconds, and rebuilds the filter from scratch every
+    ``rebuild_interval`` seconds so purged ids stop taking up space.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+        rebuild_interval: float = settings.TOKEN_REVOCATION_REBUILD_SECONDS,
+        capacity: int = settings.TOKEN_REVOCATION_BLOOM_CAPACITY,
+        error_rate: float = settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+        session_factory: Optional[Callable] = None,
+    ):
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._session_factory = session_factory
+        self._filter = BloomFilter(capacity, error_rate)
+        self._watermark: Optional[datetime] = None
+        self._last_rebuild = time.monotonic()
+        self._added_during_rebuild: Optional[list] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.db_checks = 0
+
+    def configure(self, app_settings: Settings) -> None:
+        """
+        Apply an app's ``TOKEN_REVOCATION_*`` settings before ``start``.
+
+        The filter is resized and emptied; ``start`` loads it again.
+        """
+        with self._lock:
+            self.refresh_interval = app_settings.TOKEN_REVOCATION_REFRESH_SECONDS
+            self.rebuild_interval = app_settings.TOKEN_REVOCATION_REBUILD_SECONDS
+            self.capacity = app_settings.TOKEN_REVOCATION_BLOOM_CAPACITY
+            self.error_rate = app_settings.TOKEN_REVOCATION_BLOOM_ERROR_RATE
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._watermark = None
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """Bloom filter test only; False means definitely not revoked."""
+        return jti in self._filter
+
+    def is_revoked(self, jti: str, db) -> bool:
+        """Return True if ``jti`` is revoked, querying ``db`` only on a filter hit."""
+        if jti not in self._filter:
+            cache_hit("revocation_filter")
+            return False
+
+        from app.models.revoked_token import RevokedToken
+
+        self.db_checks += 1
+        cache_miss("revocation_filter")
+        return db.get(RevokedToken, jti) is not None
+
+    def revoke(self, db, jti: str, expires_at: datetime, user_id: Optional[UUID] = None) -> None:
+        """Record a revocation in the session and in this worker's filter. Caller commits."""
+        from app.models.revoked_token import RevokedToken
+        from app.models.user import _insert_for
+
+        db.execute(
+            _insert_for(db)(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing()
+        )
+        with self._lock:
+            self._filter.add(jti)
+            if self._added_during_rebuild is not None:
+                self._added_during_rebuild.append(jti)
+
+    def refresh(self) -> int:
+        """Add ids revoked since the last refresh (or rebuild if due). Returns rows read."""
+        from app.models.revoked_token import RevokedToken
+
+        rebuild = time.monotonic() - self._last_rebuild >= self.rebuild_interval
+        if rebuild:
+            with self._lock:
+                self._added_during_rebuild = []
+        db = self._get_session_factory()()
+        try:
+            if rebuild:
+                RevokedToken.purge_expired(db)
+                db.commit()
+
+            stmt = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+                RevokedToken.expires_at >= datetime.utcnow()
+            )
+            if not rebuild and self._watermark is not None:
+                # Overlap the window so rows committed out of timestamp order are not missed
+                since = self._watermark - timedelta(seconds=max(self.refresh_interval, 1.0) * 2)
+                stmt = stmt.where(RevokedToken.revoked_at >= since)
+            rows = db.execute(stmt).all()
+        except Exception:
+            with self._lock:
+                self._added_during_rebuild = None
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            target = BloomFilter(self.capacity, self.error_rate) if rebuild else self._filter
+            for jti, revoked_at in rows:
+                target.add(jti)
+                if self._watermark is None or revoked_at > self._watermark:
+                    self._watermark = revoked_at
+            if rebuild:
+                # Keep ids revoked locally while the rebuild query ran
+                for jti in self._added_during_rebuild:
+                    target.add(jti)
+                self._added_during_rebuild = None
+                self._filter = target
+                self._last_rebuild = time.monotonic()
+        return len(rows)
+
+    def start(self) -> None:
+        """Load the filter and start the refresh thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        # The first load reads every live row; the rebuild schedule counts from here
+        self._last_rebuild = time.monotonic()
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.error("Token revocation list load failed: %s", e)
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocation-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the refresh thread."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error("Token revocation list refresh failed: %s", e)
+
+    def _get_session_factory(self) -> Callable:
+        if self._session_factory is None:
+            from app.database import SessionLocal
+            return SessionLocal
+        return self._session_factory
+
+
+token_revocation_list = TokenRevocationList()
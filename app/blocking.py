@@ -0,0 +1,110 @@
+# app/blocking.py
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from app.config import Settings, settings
+from app.metrics import BLOCKING_CALLS
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _blocking_location(frames: List[traceback.FrameSummary]) -> str:
+    """Innermost frame in this project, e.g. ``main.py:login``; that is the code to fix."""
+    for frame in reversed(frames):
+        path = os.path.abspath(frame.filename)
+        if path.startswith(_PROJECT_ROOT) and "site-packages" not in path:
+            return f"{os.path.relpath(path, _PROJECT_ROOT)}:{frame.name}"
+    return f"{os.path.basename(frames[-1].filename)}:{frames[-1].name}" if frames else "unknown"
+
+
+class BlockingCallDetector:
+    """
+    Debug aid that reports what is blocking the event loop, while it blocks.
+
+    A callback on the loop bumps a heartbeat every ``threshold / 4`` seconds.
+    A watchdog thread notices when the heartbeat is older than ``threshold``
+    and captures the loop thread's current stack, which points at the
+    handler and the sync call (SQLAlchemy, bcrypt, ...) holding the loop.
+    Each stall is reported once: logged, kept in ``reports`` and counted in
+    ``blocking_calls_total`` by location. Off by default
+    (``BLOCKING_CALL_DETECTION``) since the heartbeat wakes the loop often.
+    """
+
+    def __init__(self, threshold: float = settings.BLOCKING_CALL_THRESHOLD_SECONDS, max_reports: int = 100):
+        self.threshold = threshold
+        self.reports: Deque[Dict] = deque(maxlen=max_reports)
+        self._interval = threshold / 4
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        self._reported_beat = None
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``BLOCKING_CALL_THRESHOLD_SECONDS``; takes effect at the next ``start``."""
+        self.threshold = app_settings.BLOCKING_CALL_THRESHOLD_SECONDS
+        self._interval = self.threshold / 4
+
+    def start(self) -> None:
+        """Start watching the running loop (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._watch, name="blocking-call-detector", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self._interval, self._beat)
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self._interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat
+            if stalled > self.threshold and self._reported_beat != beat:
+                self._reported_beat = beat
+                self._report(stalled)
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        frames = traceback.extract_stack(frame)
+        location = _blocking_location(frames)
+        report = {
+            "location": location,
+            "stalled_ms": round(stalled * 1000, 1),
+            "stack": "".join(traceback.format_list(frames)),
+        }
+        self.reports.append(report)
+        BLOCKING_CALLS.labels(location).inc()
+        logger.warning(
+            "Event loop blocked for %.0f ms at %s\n%s", stalled * 1000, location, report["stack"]
+        )
+
+
+blocking_call_detector = BlockingCallDetector()
@@ -0,0 +1,202 @@
+# app/compression.py
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def _encodings_for(accept_encoding: str) -> dict:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str], brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Pick ``"br"``, ``"gzip"`` or None for an Accept-Encoding header.
+
+    Brotli wins ties because it compresses text noticeably better; ``*``
+    stands in for any coding the client did not list.
+    """
+    if not accept_encoding:
+        return None
+    accepted = _encodings_for(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    br_q = accepted.get("br", wildcard) if brotli_available else 0.0
+    gzip_q = accepted.get("gzip", wildcard)
+    if br_q > 0 and br_q >= gzip_q:
+        return "br"
+    if gzip_q > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Streaming gzip or brotli encoder with a common interface."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._gzip = None
+        else:
+            self._brotli = None
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data)
+        return self._gzip.compress(data)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._gzip.flush()
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    """Compress a complete body with ``"br"`` or ``"gzip"``."""
+    compressor = _Compressor(encoding, gzip_level, brotli_quality)
+    return compressor.compress(body) + compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli compression for HTTP responses.
+
+    Bodies smaller than ``minimum_size``, non-text content types and responses
+    that already carry a Content-Encoding are passed through uncompressed.
+    Whenever a coding is negotiated, ETags of responses the app did not
+    encode itself are weakened, 304s included. Template pages arrive already
+    compressed from ``PageCache`` and pass straight through.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """Compress a complete body at the configured level."""
+        return compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+
+
+class _CompressionResponder:
+    """Per-request ``send`` wrapper that decides on compression at the first body chunk."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send_downstream = send
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk shows what we are sending
+            self.start_message = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send_downstream(message)
+            return
+
+        if self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if not more_body:
+                body += self.compressor.finish()
+            await self.send_downstream({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        await self._start(message)
+
+    async def _start(self, message: Message) -> None:
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        content_type = headers.get("content-type", "")
+
+        already_encoded = "content-encoding" in headers
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/") and not already_encoded:
+            # A 304 cannot tell whether the 200 it stands for would have been
+            # compressed (that depends on the body's type and size), so with a
+            # negotiated coding every ETag is weak and the two always agree
+            headers["ETag"] = f"W/{etag}"
+
+        if already_encoded or not content_type.startswith(COMPRESSIBLE_TYPES):
+            self.passthrough = True
+            await self.send_downstream(self.start_message)
+            await self.send_downstream(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(body) < self.middleware.minimum_size:
+            self.passthrough = True
+            await self.send_downstream(self.start_message)
+            await self.send_downstream(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+
+        if not more_body:
+            body = self.middleware.compress(body, self.encoding)
+            headers["Content-Length"] = str(len(body))
+            await self.send_downstream(self.start_message)
+            await self.send_downstream({"type": "http.response.body", "body": body})
+            return
+
+        # Streaming response: length is unknown until the last chunk
+        del headers["Content-Length"]
+        self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+        await self.send_downstream(self.start_message)
+        await self.send_downstream(
+            {"type": "http.response.body", "body": self.compressor.compress(body), "more_body": True}
+        )
@@ -0,0 +1,58 @@
+# app/conditional.py
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """
+    Strong ETag from validator values such as ids and row versions.
+
+    Callers pass whatever identifies the representation (row versions, the
+    negotiated media type, ...), never the serialized body itself.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP-date, dropping sub-second precision."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    True if the request's If-None-Match matches ``etag``.
+
+    Uses the weak comparison RFC 9110 requires for If-None-Match, so an
+    ETag weakened by the compression middleware still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(candidate.strip()) == wanted for candidate in header.split(","))
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> Dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    """Empty 304 carrying the same validators a 200 would have."""
+    return Response(status_code=304, headers={**headers, "Vary": "Accept"})
@@ -1,24 +1,36 @@
 # app/database.py
 
+import logging
+from typing import Optional
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.exc import SQLAlchemyError
 
 from .config import settings
 
-def get_engine(database_url: str = settings.DATABASE_URL):
+logger = logging.getLogger(__name__)
+
+def get_engine(database_url: str = settings.DATABASE_URL, echo: Optional[bool] = None):
     """
     Create and return a new SQLAlchemy engine.
 
     Args:
         database_url (str): The database connection URL.
+        echo (bool): Log SQL statements; defaults to ``settings.DB_ECHO``.
 
     Returns:
         Engine: A new SQLAlchemy Engine instance.
     """
+    if echo is None:
+        echo = settings.DB_ECHO
     try:
-        # Create an engine instance with echo=True to log SQL queries (useful for learning)
-        engine = create_engine(database_url, echo=True)
+        # SQL is logged (useful for learning) through the standard logging tree,
+        # and so through the background log writer, rather than echo=True's
+        # own synchronous stdout handler
+        engine = create_engine(database_url)
+        if echo:
+            logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
         return engine
     except SQLAlchemyError as e:
         print(f"Error creating engine: {e}")
@@ -40,9 +52,80 @@ def get_sessionmaker(engine):
         bind=engine        # Bind the sessionmaker to the provided engine
     )
 
-# Initialize engine and SessionLocal using the factory functions
-engine = get_engine()
-SessionLocal = get_sessionmaker(engine)
+# The engine and SessionLocal are created on first use rather than at import,
+# so importing models or schemas never touches the database configuration.
+# create_app's lifespan initializes them eagerly for a serving worker.
+_engine = None
+_session_factory = None
+
+def init_engine(database_url: Optional[str] = None, echo: Optional[bool] = None):
+    """
+    Return the process-wide engine, creating it (and SessionLocal) on first call.
+
+    Args:
+        database_url (str): URL to use if the engine does not exist yet;
+            defaults to ``settings.DATABASE_URL``.
+        echo (bool): SQL logging for a new engine; defaults to ``settings.DB_ECHO``.
+
+    Returns:
+        Engine: The shared SQLAlchemy Engine instance.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        _engine = get_engine(database_url or settings.DATABASE_URL, echo)
+        _session_factory = get_sessionmaker(_engine)
+    return _engine
+
+def prewarm_pool(engine, connections: int) -> int:
+    """
+    Open up to ``connections`` pooled connections before serving traffic.
+
+    The connections are checked out together (so each one is a real new
+    connection), pinged and returned to the pool, sparing the first requests
+    the connect and authentication round trips. Capped at the pool size,
+    since overflow connections are closed again on check-in. A database that
+    is down is logged, not raised; readiness reports it.
+
+    Returns:
+        int: Number of connections opened.
+    """
+    size = getattr(engine.pool, "size", None)
+    if callable(size):
+        connections = min(connections, size())
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.exec_driver_sql("SELECT 1")
+    except SQLAlchemyError as e:
+        logger.warning("Connection pool warmup stopped after %d connection(s): %s", len(opened), e)
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+def get_session_factory():
+    """Return the shared sessionmaker, creating the engine if needed."""
+    if _session_factory is None:
+        init_engine()
+    return _session_factory
+
+def dispose_engine():
+    """Close pooled connections and forget the engine; the next use creates a new one."""
+    global _engine, _session_factory
+    if _engine is not None:
+        _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+def __getattr__(name):
+    # Keeps ``from app.database import engine, SessionLocal`` working lazily
+    if name == "engine":
+        return init_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Base declarative class that our models will inherit from
 Base = declarative_base()
@@ -57,7 +140,7 @@ def get_db():
     Yields:
         Session: A SQLAlchemy Session instance.
     """
-    db = SessionLocal()  # Create a new database session
+    db = get_session_factory()()  # Create a new database session
     try:
         yield db  # Provide the session to the caller
     finally:
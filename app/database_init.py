@@ -1,11 +1,72 @@
-from app.database import engine, Base
+from sqlalchemy import text
+
+from app.database import init_engine, Base
 from app.models.user import User  # Import User to register it with Base
+from app.models.calculation import Calculation  # noqa: F401
+from app.models.refresh_token import RefreshToken  # noqa: F401
+from app.models.api_key import ApiKey  # noqa: F401
+from app.models.revoked_token import RevokedToken  # noqa: F401
+
+# create_all only creates missing tables, so columns added to an existing
+# table are applied here. Each statement is idempotent; existing rows are
+# backfilled through the column default, which is then dropped where the
+# model has none.
+UPGRADES = (
+    """
+    ALTER TABLE calculations
+        ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1,
+        ADD COLUMN IF NOT EXISTS created_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now()),
+        ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP NOT NULL DEFAULT timezone('utc', now())
+    """,
+    """
+    ALTER TABLE calculations
+        ALTER COLUMN created_at DROP DEFAULT,
+        ALTER COLUMN updated_at DROP DEFAULT
+    """,
+    # The login lookup filters on lower(email) / lower(username); without
+    # these indexes every login on an older database is a sequential scan
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email_lower ON users (lower(email))",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username_lower ON users (lower(username))",
+)
+
+# Users that differ only by case (Bob / bob) were allowed before the lower()
+# indexes existed and make creating them fail; they have to be merged or
+# renamed by hand first.
+CASE_DUPLICATES = """
+    SELECT 'email', lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1
+    UNION ALL
+    SELECT 'username', lower(username) FROM users GROUP BY lower(username) HAVING count(*) > 1
+"""
+
+def check_case_duplicates(connection):
+    """Raise if existing users would violate the case-insensitive unique indexes."""
+    missing = connection.execute(text(
+        "SELECT to_regclass('ix_users_email_lower') IS NULL OR to_regclass('ix_users_username_lower') IS NULL"
+    )).scalar()
+    if not missing:
+        return
+    duplicates = connection.execute(text(CASE_DUPLICATES)).all()
+    if duplicates:
+        listed = ", ".join(f"{field} {value!r}" for field, value in duplicates)
+        raise RuntimeError(
+            f"Users differ only by case ({listed}); resolve them before upgrading. "
+            "No upgrade was applied."
+        )
+
+def upgrade_db(engine=None):
+    """Bring tables created by an older release up to the current models."""
+    with (engine or init_engine()).begin() as connection:
+        check_case_duplicates(connection)
+        for statement in UPGRADES:
+            connection.execute(text(statement))
 
 def init_db():
+    engine = init_engine()
     Base.metadata.create_all(bind=engine)
+    upgrade_db(engine)
 
 def drop_db():
-    Base.metadata.drop_all(bind=engine)
+    Base.metadata.drop_all(bind=init_engine())
 
 if __name__ == "__main__":
-    init_db() # pragma: no cover
\ No newline at end of file
+    init_db() # pragma: no cover
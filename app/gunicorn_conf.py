@@ -0,0 +1,78 @@
+# app/gunicorn_conf.py
+
+"""
+Gunicorn settings and hooks for running the app on several uvicorn workers.
+
+    gunicorn main:app --preload -k uvicorn.workers.UvicornWorker -c python:app.gunicorn_conf
+
+``uvicorn --workers N`` starts every worker as a fresh interpreter that
+imports and initializes the whole app on its own. With ``--preload`` the
+gunicorn master imports the app once; ``when_ready`` then runs the warmup
+steps that need no database and calls ``gc.freeze()`` before the workers
+are forked, so they share those pages copy-on-write. Each worker's lifespan
+still creates its own engine and pool after the fork. Gunicorn supervises
+the workers: one that stops checking in for ``timeout`` seconds is killed
+and replaced.
+"""
+
+import gc
+from typing import Tuple
+
+from app.config import settings
+
+workers = settings.WORKERS
+worker_class = "uvicorn.workers.UvicornWorker"
+# On SIGTERM a worker first drains for up to SHUTDOWN_DRAIN_SECONDS (see
+# app.lifecycle.drain_on_signal); give it that plus time for the lifespan
+# shutdown before the master kills it
+graceful_timeout = int(settings.SHUTDOWN_DRAIN_SECONDS) + 5
+
+# Warmup steps that touch no database; the master runs these before forking
+PRELOAD_STEPS = frozenset({"schemas", "bcrypt", "tokens"})
+
+
+def split_warmup_steps(steps: str) -> Tuple[str, str]:
+    """Split WARMUP_STEPS into (steps the master can run, steps each worker runs)."""
+    names = [name.strip() for name in steps.split(",") if name.strip()]
+    return (
+        ",".join(name for name in names if name in PRELOAD_STEPS),
+        ",".join(name for name in names if name not in PRELOAD_STEPS),
+    )
+
+
+def freeze_preloaded_app(app) -> int:
+    """
+    Warm the preloaded ``app`` in the master, then freeze the heap.
+
+    The database-free warmup steps run here, once, and the app's
+    WARMUP_STEPS is narrowed to the rest. ``gc.freeze()`` moves everything
+    allocated so far out of the collector's reach, so collections in the
+    workers do not write to (and un-share) those pages. Returns the number
+    of frozen objects.
+    """
+    from app.database import dispose_engine
+    from app.warmup import warm_up
+
+    app_settings = app.state.settings
+    in_master, in_workers = split_warmup_steps(app_settings.WARMUP_STEPS)
+    warm_up(None, in_master)
+    app.state.settings = app_settings.model_copy(update={"WARMUP_STEPS": in_workers})
+    # Pooled connections must never be shared across a fork
+    dispose_engine()
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def when_ready(server) -> None:
+    if not server.cfg.preload_app:
+        return
+    frozen = freeze_preloaded_app(server.app.wsgi())
+    server.log.info("Preloaded app warmed up; %d objects frozen before forking", frozen)
+
+
+def child_exit(server, worker) -> None:
+    # A worker that crashed never ran its lifespan shutdown
+    from app.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
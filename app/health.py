@@ -0,0 +1,179 @@
+# app/health.py
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from app.config import Settings, settings
+from app.metrics import LOOP_LAG, LOOP_LAG_LAST
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a timed sleep.
+
+    Every ``interval`` seconds a task sleeps for ``interval`` and records how
+    much longer than that it actually took; anything blocking the loop shows
+    up as lag. ``max_lag`` is the worst sample since the last ``reset_max``;
+    each readiness check takes and resets it.
+    Samples are exported as the ``event_loop_lag_seconds`` histogram, and the
+    latest one as the ``event_loop_lag_last_seconds`` gauge.
+    """
+
+    def __init__(self, interval: float = settings.LOOP_LAG_SAMPLE_SECONDS):
+        self.interval = interval
+        self.lag: Optional[float] = None
+        self.max_lag = 0.0
+        self.samples = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``LOOP_LAG_SAMPLE_SECONDS``; takes effect at the next ``start``."""
+        self.interval = app_settings.LOOP_LAG_SAMPLE_SECONDS
+
+    def start(self) -> None:
+        """Start sampling on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def record(self, lag: float) -> None:
+        LOOP_LAG.observe(lag)
+        LOOP_LAG_LAST.set(lag)
+        self.lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.samples += 1
+
+    def reset_max(self) -> float:
+        """Return the worst lag since the previous call and start over."""
+        worst, self.max_lag = self.max_lag, 0.0
+        return worst
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - started - self.interval))
+
+
+def pool_status(engine) -> Dict[str, Any]:
+    """Checked-out connections against the pool's capacity (size + max overflow)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        # NullPool/StaticPool (e.g. sqlite in tests) have nothing to saturate
+        return {"size": None, "checked_out": None, "overflow": None, "capacity": None, "utilization": None}
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "utilization": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+class ReadinessProbe:
+    """
+    Readiness check for the load balancer.
+
+    The database ping result is cached for ``cache_seconds`` and only one
+    ping runs at a time, so however often probes arrive the database sees at
+    most one ``SELECT 1`` per interval per worker. A saturated pool fails
+    readiness without pinging, since the ping would only queue for a
+    connection behind the requests that exhausted it.
+    """
+
+    def __init__(
+        self,
+        cache_seconds: float = settings.HEALTH_DB_PING_CACHE_SECONDS,
+        max_pool_utilization: float = settings.HEALTH_MAX_POOL_UTILIZATION,
+        max_loop_lag: float = settings.HEALTH_MAX_LOOP_LAG_SECONDS,
+        loop_monitor: Optional[LoopLagMonitor] = None,
+    ):
+        self.cache_seconds = cache_seconds
+        self.max_pool_utilization = max_pool_utilization
+        self.max_loop_lag = max_loop_lag
+        self.loop_monitor = loop_monitor
+        self._last_ping: Optional[Dict[str, Any]] = None
+        self._last_ping_at = float("-inf")
+        self._lock = threading.Lock()
+        self.pings = 0
+
+    def configure(self, app_settings: Settings) -> None:
+        """Apply an app's ``HEALTH_*`` thresholds and forget the cached ping."""
+        with self._lock:
+            self.cache_seconds = app_settings.HEALTH_DB_PING_CACHE_SECONDS
+            self.max_pool_utilization = app_settings.HEALTH_MAX_POOL_UTILIZATION
+            self.max_loop_lag = app_settings.HEALTH_MAX_LOOP_LAG_SECONDS
+            self._last_ping = None
+
+    def ping(self, engine) -> Dict[str, Any]:
+        """Run ``SELECT 1`` unless a result younger than ``cache_seconds`` exists."""
+        with self._lock:
+            age = time.monotonic() - self._last_ping_at
+            if self._last_ping is not None and age < self.cache_seconds:
+                return {**self._last_ping, "cached": True}
+
+            self.pings += 1
+            started = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                result = {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 2)}
+            except Exception as e:
+                logger.error("Readiness DB ping failed: %s", e)
+                result = {"ok": False, "error": str(e).splitlines()[0] if str(e) else type(e).__name__}
+            self._last_ping = result
+            self._last_ping_at = time.monotonic()
+            return {**result, "cached": False}
+
+    def check(self, engine, draining: bool = False) -> Dict[str, Any]:
+        """Return the readiness report; ``report["ready"]`` decides 200 vs 503."""
+        problems = ["shutting down"] if draining else []
+
+        pool = pool_status(engine)
+        saturated = pool["utilization"] is not None and pool["utilization"] >= self.max_pool_utilization
+        if saturated:
+            problems.append("connection pool saturated")
+            database = {"ok": None, "skipped": "pool saturated"}
+        else:
+            database = self.ping(engine)
+            if not database["ok"]:
+                problems.append("database unreachable")
+
+        loop = {"lag_ms": None, "max_lag_ms": None}
+        if self.loop_monitor is not None and self.loop_monitor.lag is not None:
+            loop = {
+                "lag_ms": round(self.loop_monitor.lag * 1000, 2),
+                # Worst lag since the previous check, so a stall between probes still shows
+                "max_lag_ms": round(self.loop_monitor.reset_max() * 1000, 2),
+            }
+            if self.loop_monitor.lag > self.max_loop_lag:
+                problems.append("event loop lagging")
+
+        return {
+            "ready": not problems,
+            "status": "ready" if not problems else "not_ready",
+            "problems": problems,
+            "checks": {"database": database, "pool": pool, "event_loop": loop},
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
+readiness_probe = ReadinessProbe(loop_monitor=loop_lag_monitor)
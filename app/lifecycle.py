@@ -0,0 +1,157 @@
+# app/lifecycle.py
+
+import asyncio
+import json
+import logging
+import signal
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+_SHUTTING_DOWN_BODY = json.dumps({"error": "Server is shutting down"}).encode()
+
+# The signals uvicorn (and gunicorn's UvicornWorker) shut down on
+HANDLED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+
+class RequestTracker:
+    """
+    Counts in-flight HTTP requests and gates new ones during shutdown.
+
+    ``start_draining`` flips the worker into draining mode: readiness fails
+    and ``DrainMiddleware`` answers new requests with 503 + ``Connection:
+    close`` so clients retry on another worker. ``drain`` then waits for
+    the requests already running.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.draining = False
+        self.rejected = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def started(self) -> None:
+        self.in_flight += 1
+
+    def finished(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0 and self._idle is not None:
+            self._idle.set()
+
+    def start_accepting(self) -> None:
+        """Serve requests again (an app object can be started more than once)."""
+        self.draining = False
+
+    def start_draining(self) -> None:
+        self.draining = True
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for in-flight requests; True if none are left."""
+        self.start_draining()
+        if self.in_flight == 0:
+            return True
+        self._idle = asyncio.Event()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Shutdown drain deadline of %.1fs passed with %d request(s) in flight",
+                           timeout, self.in_flight)
+            return False
+        finally:
+            self._idle = None
+        logger.info("Drained in-flight requests in %.2fs", time.monotonic() - started)
+        return True
+
+
+class DrainMiddleware:
+    """
+    Pure ASGI middleware feeding ``RequestTracker`` and refusing work while draining.
+
+    ``exempt_paths`` (health probes, metrics) are neither counted nor
+    refused, so probes keep answering truthfully during the drain.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: RequestTracker, exempt_paths: Tuple[str, ...] = ()):
+        self.app = app
+        self.tracker = tracker
+        self.exempt_paths = frozenset(exempt_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+        if self.tracker.draining:
+            self.tracker.rejected += 1
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(_SHUTTING_DOWN_BODY)).encode()),
+                    (b"connection", b"close"),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _SHUTTING_DOWN_BODY})
+            return
+        self.tracker.started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.finished()
+
+
+def drain_on_signal(tracker: RequestTracker, timeout: float) -> Callable[[], None]:
+    """
+    Start draining as soon as the server is told to stop, before it stops.
+
+    Takes SIGINT/SIGTERM over from the server: the first signal flips
+    ``tracker`` into draining (readiness fails, new requests get 503) and
+    waits up to ``timeout`` seconds for in-flight requests; only then is
+    the signal handed to the server's own handler, which closes the
+    listeners and runs the lifespan shutdown. A second signal is handed on
+    at once. Returns a function that puts the server's handlers back.
+    Signals can only be handled on the main thread; elsewhere (e.g. under
+    TestClient) this does nothing.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return lambda: None
+    loop = asyncio.get_running_loop()
+    previous = {}
+    tasks = set()
+
+    def hand_on(sig: int) -> None:
+        handler = previous.get(sig)
+        if callable(handler):
+            handler(sig, None)
+
+    async def drain_then_hand_on(sig: int) -> None:
+        await tracker.drain(timeout)
+        hand_on(sig)
+
+    def start_drain(sig: int) -> None:
+        task = loop.create_task(drain_then_hand_on(sig))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def handle(sig: int, frame) -> None:
+        if tracker.draining:
+            hand_on(sig)
+            return
+        logger.info("Received %s; draining before shutdown", signal.Signals(sig).name)
+        tracker.start_draining()
+        loop.call_soon_threadsafe(start_drain, sig)
+
+    for sig in HANDLED_SIGNALS:
+        previous[sig] = signal.signal(sig, handle)
+
+    def restore() -> None:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+
+    return restore
@@ -0,0 +1,178 @@
+# app/logging_setup.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.metrics import LOG_RECORDS_DROPPED
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_of(request) -> str:
+    """Route template of a request, for ``extra={"route": ...}`` on log calls."""
+    route = request.scope.get("route")
+    # Unmatched paths share one key so scanners can't grow the sampler's table
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extras and exception."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+
+class RepeatedErrorSampler(logging.Filter):
+    """
+    Lets through the first ``burst`` copies of a warning/error per window.
+
+    Copies are identified by route, logger and the unformatted message
+    template, so "Login error: %s" on ``/users/login`` is one stream however
+    the arguments differ. Further copies inside ``window`` seconds are
+    dropped before they are queued; the first record of the next window
+    carries ``suppressed`` with the number dropped.
+    """
+
+    def __init__(self, window: float = settings.LOG_SAMPLE_WINDOW_SECONDS, burst: int = settings.LOG_SAMPLE_BURST):
+        super().__init__()
+        self.window = window
+        self.burst = burst
+        self._streams: Dict[Tuple, List] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING or self.burst <= 0:
+            return True
+        key = (getattr(record, "route", None), record.name, record.msg if isinstance(record.msg, str) else None)
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None or record.created - stream[0] >= self.window:
+                suppressed = stream[1] - self.burst if stream is not None and stream[1] > self.burst else 0
+                self._streams[key] = [record.created, 1]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            stream[1] += 1
+            if stream[1] <= self.burst:
+                return True
+        LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting or blocking.
+
+    The stock ``prepare`` formats the message in the caller's thread; the
+    queue here never leaves the process, so the record goes as-is and the
+    listener does the formatting. Once ``maxsize`` records are waiting the
+    record is dropped (and counted) instead of making the request wait. The
+    bound is checked here because ``queue.Queue``'s condition-variable
+    handoff can stall the caller for a GIL switch interval or more;
+    ``SimpleQueue`` does not.
+    """
+
+    def __init__(self, records: queue.SimpleQueue, maxsize: int = settings.LOG_QUEUE_SIZE):
+        super().__init__(records)
+        self.maxsize = maxsize
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.maxsize > 0 and self.queue.qsize() >= self.maxsize:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+            return
+        self.queue.put_nowait(record)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(
+    level: str = settings.LOG_LEVEL,
+    json_format: bool = settings.LOG_JSON,
+    queue_size: int = settings.LOG_QUEUE_SIZE,
+    stream=None,
+) -> QueueListener:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Idempotent: later calls return the running listener. The listener is
+    stopped at interpreter exit, which writes out whatever is still queued.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if json_format
+        else logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    records = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(records, maxsize=queue_size)
+    handler.addFilter(RepeatedErrorSampler())
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, NonBlockingQueueHandler):
+            root.removeHandler(handler)
+    _listener = None
+
+
+def _pause_listener() -> None:
+    # A fork while the writer thread holds the output stream's lock would
+    # leave that lock held forever in the child: write out what is queued
+    # and stop the thread first, then start one on each side of the fork
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def _resume_listener() -> None:
+    if _listener is not None and _listener._thread is None:
+        _listener.start()
+
+
+os.register_at_fork(before=_pause_listener, after_in_parent=_resume_listener, after_in_child=_resume_listener)
@@ -0,0 +1,64 @@
+# app/memory_report.py
+
+"""
+Per-process memory of a running multi-worker server.
+
+Usage:
+    python -m app.memory_report MASTER_PID
+"""
+
+import argparse
+import sys
+from typing import Dict, List, Optional
+
+
+def worker_memory(pids) -> List[Dict[str, float]]:
+    """
+    RSS and USS (memory unique to the process) in MiB for each live pid.
+
+    RSS counts shared copy-on-write pages in every worker; USS is what
+    stopping that worker would free. Reading USS needs access to the
+    process's /proc/<pid>/smaps (same user or root).
+    """
+    import psutil
+
+    rows = []
+    for pid in pids:
+        try:
+            info = psutil.Process(pid).memory_full_info()
+        except psutil.NoSuchProcess:
+            continue
+        rows.append({"pid": pid, "rss_mb": info.rss / 2**20, "uss_mb": info.uss / 2**20})
+    return rows
+
+
+def memory_report(master_pid: int) -> str:
+    """Per-worker RSS/USS table for a running master, plus totals."""
+    import psutil
+
+    workers = worker_memory(child.pid for child in psutil.Process(master_pid).children())
+    master = worker_memory([master_pid])
+    lines = [f"{'process':<16} {'RSS MiB':>9} {'USS MiB':>9}"]
+    for label, rows in (("master", master), ("worker", workers)):
+        for row in rows:
+            lines.append(f"{label + ' ' + str(row['pid']):<16} {row['rss_mb']:9.1f} {row['uss_mb']:9.1f}")
+    everything = master + workers
+    lines.append(f"{'sum':<16} {sum(r['rss_mb'] for r in everything):9.1f} "
+                 f"{sum(r['uss_mb'] for r in everything):9.1f}")
+    # Shared pages are counted once in the master's RSS
+    if master:
+        footprint = master[0]["rss_mb"] + sum(r["uss_mb"] for r in workers)
+        lines.append(f"approximate footprint (master RSS + worker USS): {footprint:.1f} MiB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("master_pid", type=int, help="pid of the gunicorn master")
+    args = parser.parse_args(argv)
+    print(memory_report(args.master_pid))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
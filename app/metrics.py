@@ -0,0 +1,152 @@
+# app/metrics.py
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.config import Settings, settings
+
+# prometheus_client picks its value storage when first imported, so the
+# shared directory has to be in the environment before that happens
+if settings.METRICS_MULTIPROC_DIR and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(settings.METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = settings.METRICS_MULTIPROC_DIR
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+REQUESTS = Counter(
+    "http_requests_total", "Requests handled, by route template and status.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent in the route handler, dependencies included.",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests currently inside a route handler.",
+    ["method", "route"], multiprocess_mode="livesum",
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Pooled connections currently checked out.",
+    multiprocess_mode="livesum",
+)
+POOL_CAPACITY = Gauge(
+    "db_pool_capacity", "Pool size plus max overflow.",
+    multiprocess_mode="livesum",
+)
+BCRYPT_IN_PROGRESS = Gauge(
+    "bcrypt_operations_in_progress", "Password hashes/verifications running now (hashing runs inline; there is no queue).",
+    multiprocess_mode="livesum",
+)
+BCRYPT_DURATION = Histogram(
+    "bcrypt_duration_seconds", "Time per password hash or verification.",
+    ["operation"], buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0),
+)
+LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke from a timed sleep.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds", "Most recent event loop lag sample; across workers, the highest one.",
+    multiprocess_mode="livemax",
+)
+BLOCKING_CALLS = Counter(
+    "blocking_calls_total", "Event loop stalls over the detector threshold, by innermost project frame.",
+    ["location"],
+)
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records not written: sampled repeats or a full log queue.",
+    ["reason"],
+)
+TRACES_DROPPED = Counter(
+    "traces_dropped_total", "Finished traces not exported because the export queue was full.",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss).",
+    ["cache", "result"],
+)
+
+
+_cache_metrics_enabled = settings.METRICS_ENABLED
+
+
+def configure_metrics(app_settings: Settings) -> None:
+    """
+    Apply an app's ``METRICS_ENABLED`` to the cache counters.
+
+    ``METRICS_MULTIPROC_DIR`` cannot be changed here: it has to be in place
+    before prometheus_client is imported.
+    """
+    global _cache_metrics_enabled
+    _cache_metrics_enabled = app_settings.METRICS_ENABLED
+
+
+def cache_hit(cache: str) -> None:
+    if _cache_metrics_enabled:
+        CACHE_REQUESTS.labels(cache, "hit").inc()
+
+
+def cache_miss(cache: str) -> None:
+    if _cache_metrics_enabled:
+        CACHE_REQUESTS.labels(cache, "miss").inc()
+
+
+@contextmanager
+def track_bcrypt(operation: str):
+    """Count one bcrypt hash/verify in the in-progress gauge and duration histogram."""
+    BCRYPT_IN_PROGRESS.inc()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        BCRYPT_DURATION.labels(operation).observe(time.perf_counter() - started)
+        BCRYPT_IN_PROGRESS.dec()
+
+
+def instrument_engine(engine) -> None:
+    """Track checked-out connections and capacity of ``engine``'s pool."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    POOL_CAPACITY.inc(pool.size() + max(pool._max_overflow, 0))
+    event.listen(engine, "checkout", lambda *args: POOL_CHECKED_OUT.inc())
+    event.listen(engine, "checkin", lambda *args: POOL_CHECKED_OUT.dec())
+
+
+def uninstrument_engine(engine) -> None:
+    pool = engine.pool
+    if hasattr(pool, "checkedout"):
+        POOL_CAPACITY.dec(pool.size() + max(pool._max_overflow, 0))
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Drop a worker's live gauges (this process by default) from the shared directory on exit."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+def metrics_response():
+    """Render all metrics, summed across worker processes in multiprocess mode."""
+    from fastapi import Response
+
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,102 @@
+# app/models/api_key.py
+from datetime import datetime
+import hashlib
+import hmac
+import secrets
+import uuid
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+from app.models.user import User
+
+API_KEY_PREFIX = "ak_"
+PREFIX_LENGTH = 8
+
+
+def hash_api_key(raw_key: str) -> str:
+    """Return the SHA-256 hex digest stored in place of the raw key."""
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+def parse_key_prefix(raw_key: str) -> Optional[str]:
+    """Extract the lookup prefix from ``ak_<prefix>_<secret>``, or None if malformed."""
+    start = len(API_KEY_PREFIX)
+    end = start + PREFIX_LENGTH
+    if not raw_key.startswith(API_KEY_PREFIX) or len(raw_key) <= end + 1 or raw_key[end] != "_":
+        return None
+    return raw_key[start:end]
+
+
+class ApiKey(Base):
+    """
+    Per-user API key for machine clients.
+
+    The key is shown once at creation. Only its SHA-256 digest is stored,
+    together with a short plain-text prefix that is indexed for lookup and
+    lets users tell their keys apart.
+    """
+    __tablename__ = 'api_keys'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
+    prefix = Column(String(PREFIX_LENGTH), nullable=False, index=True)
+    key_hash = Column(String(64), unique=True, nullable=False)
+    scopes = Column(String(255), nullable=False, default="")  # space-separated
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ApiKey(name={self.name}, prefix={self.prefix})>"
+
+    @property
+    def scope_list(self) -> List[str]:
+        return self.scopes.split() if self.scopes else []
+
+    @classmethod
+    def create(cls, db, user_id: uuid.UUID, name: str, scopes: Iterable[str]) -> Tuple[str, "ApiKey"]:
+        """Create a key for ``user_id`` and return ``(raw_key, api_key)``."""
+        prefix = secrets.token_hex(PREFIX_LENGTH // 2)
+        raw_key = f"{API_KEY_PREFIX}{prefix}_{secrets.token_urlsafe(32)}"
+        api_key = cls(
+            user_id=user_id,
+            name=name,
+            prefix=prefix,
+            key_hash=hash_api_key(raw_key),
+            scopes=" ".join(sorted(set(scopes))),
+        )
+        db.add(api_key)
+        db.flush()
+        return raw_key, api_key
+
+    @classmethod
+    def verify(cls, db, raw_key: str) -> Optional[Tuple["ApiKey", bool]]:
+        """
+        Look up a live key by prefix and compare digests in constant time.
+
+        Returns:
+            (api_key, owner_is_active), or None if the key is unknown or revoked.
+        """
+        prefix = parse_key_prefix(raw_key)
+        if prefix is None:
+            return None
+
+        digest = hash_api_key(raw_key)
+        candidates = (
+            db.query(cls, User.is_active)
+            .join(User, User.id == cls.user_id)
+            .filter(cls.prefix == prefix, cls.revoked_at.is_(None))
+            .all()
+        )
+        for api_key, is_active in candidates:
+            if hmac.compare_digest(api_key.key_hash, digest):
+                return api_key, is_active
+        return None
+
+    def revoke(self) -> None:
+        """Mark this key as revoked."""
+        if self.revoked_at is None:
+            self.revoked_at = datetime.utcnow()
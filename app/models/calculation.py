@@ -1,4 +1,7 @@
-from sqlalchemy import Column, Integer, Float, String, ForeignKey
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, select, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -17,6 +20,11 @@ class Calculation(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     user = relationship("User", back_populates="calculations")
 
+    # Bumped by every UPDATE; with updated_at it backs ETag / Last-Modified
+    version = Column(Integer, default=1, server_default=text("1"), onupdate=text("version + 1"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
     def compute(self):
         """Compute result on demand using the factory pattern."""
         from app.operations.calculation_factory import CalculationFactory
@@ -25,3 +33,69 @@ class Calculation(Base):
             return CalculationFactory.execute_calculation(self.type, self.a, self.b)
         except ValueError as e:
             raise ValueError(f"Unsupported calculation type: {self.type}") from e
+
+    @classmethod
+    def read_columns(cls, fields: Optional[Sequence[str]] = None):
+        """
+        Columns a calculation response needs, in response field order.
+
+        ``fields`` narrows them to a sparse field set (already validated
+        against ``CALCULATION_FIELDS``).
+        """
+        columns = (cls.id, cls.a, cls.b, cls.type, cls.result)
+        if fields is None:
+            return columns
+        return tuple(column for column in columns if column.key in fields)
+
+    @classmethod
+    def fetch_page(
+        cls, db, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Read a page of calculations as plain dicts via a Core column SELECT.
+
+        Skips ORM instance construction, the identity map and relationship
+        setup; rows come back as tuples and are zipped straight into dicts.
+        Only the requested ``fields`` are selected.
+        """
+        columns = cls.read_columns(fields)
+        keys = [column.key for column in columns]
+        stmt = select(*columns).order_by(cls.id).offset(skip).limit(limit)
+        return [dict(zip(keys, row)) for row in db.execute(stmt).tuples()]
+
+    @classmethod
+    def fetch_page_versioned(
+        cls, db, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]], Optional[datetime]]:
+        """
+        ``fetch_page`` plus cache validators from the same SELECT.
+
+        Returns the page, its ``(id, version)`` pairs and the newest
+        ``updated_at`` on it (None for an empty page).
+        """
+        columns = cls.read_columns(fields)
+        keys = [column.key for column in columns]
+        stmt = (
+            select(cls.id, cls.version, cls.updated_at, *columns)
+            .order_by(cls.id).offset(skip).limit(limit)
+        )
+        rows, versions, last_modified = [], [], None
+        for id, version, updated_at, *values in db.execute(stmt).tuples():
+            rows.append(dict(zip(keys, values)))
+            versions.append((id, version))
+            if last_modified is None or updated_at > last_modified:
+                last_modified = updated_at
+        return rows, versions, last_modified
+
+    @classmethod
+    def fetch_one_versioned(
+        cls, db, id: int, fields: Optional[Sequence[str]] = None
+    ) -> Optional[Tuple[Dict[str, Any], int, datetime]]:
+        """Read a single calculation as a plain dict with its version and updated_at, or None."""
+        columns = cls.read_columns(fields)
+        stmt = select(cls.version, cls.updated_at, *columns).where(cls.id == id)
+        row = db.execute(stmt).tuples().first()
+        if row is None:
+            return None
+        version, updated_at, *values = row
+        return dict(zip([column.key for column in columns], values)), version, updated_at
@@ -0,0 +1,127 @@
+# app/models/refresh_token.py
+from datetime import datetime, timedelta
+import hashlib
+import secrets
+import uuid
+from typing import Optional, Tuple
+
+from sqlalchemy import Column, String, DateTime, ForeignKey, update
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.auth.refresh_tokens import refresh_token_buffer
+from app.config import settings
+from app.database import Base
+
+
+def hash_refresh_token(raw_token: str) -> str:
+    """Return the SHA-256 hex digest stored in place of the raw token."""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+class RefreshToken(Base):
+    """
+    Opaque, rotating refresh token.
+
+    Only the SHA-256 digest is stored, so a refresh is one indexed lookup
+    instead of a bcrypt verification. Every token belongs to a family started
+    at login; presenting an already-rotated token revokes the whole family.
+    """
+    __tablename__ = 'refresh_tokens'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<RefreshToken(user_id={self.user_id}, family_id={self.family_id})>"
+
+    @classmethod
+    def issue(cls, db, user_id: uuid.UUID, family_id: Optional[uuid.UUID] = None) -> str:
+        """Create a refresh token for ``user_id`` and return the raw value."""
+        raw_token = secrets.token_urlsafe(32)
+        db.add(cls(
+            user_id=user_id,
+            family_id=family_id or uuid.uuid4(),
+            token_hash=hash_refresh_token(raw_token),
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        ))
+        db.flush()
+        return raw_token
+
+    @classmethod
+    def issue_deferred(cls, user_id: uuid.UUID) -> str:
+        """
+        Like ``issue`` for a new family, but the row is queued in
+        ``refresh_token_buffer`` and inserted by its flusher, so the login
+        request does no write.
+        """
+        raw_token = secrets.token_urlsafe(32)
+        now = datetime.utcnow()
+        refresh_token_buffer.put(hash_refresh_token(raw_token), (
+            uuid.uuid4(), user_id, uuid.uuid4(), now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS), now,
+        ))
+        return raw_token
+
+    @classmethod
+    def rotate(cls, db, raw_token: str) -> Optional[Tuple[str, uuid.UUID]]:
+        """
+        Exchange a valid refresh token for a new one in the same family.
+
+        The old token is consumed with a single conditional UPDATE, so two
+        concurrent refreshes with the same token cannot both succeed.
+
+        Returns:
+            (new_raw_token, user_id), or None if the token is unknown,
+            expired or already used. Reuse of a rotated token revokes its family.
+        """
+        now = datetime.utcnow()
+        token_hash = hash_refresh_token(raw_token)
+        # A token from a login moments ago may still be waiting to be inserted
+        refresh_token_buffer.flush_if_pending(token_hash)
+        consumed = db.execute(
+            update(cls)
+            .where(
+                cls.token_hash == token_hash,
+                cls.revoked_at.is_(None),
+                cls.expires_at > now,
+            )
+            .values(revoked_at=now)
+            .returning(cls.user_id, cls.family_id)
+        ).first()
+
+        if consumed is None:
+            # A known but already-revoked token means it leaked: kill the family
+            stale = db.query(cls.family_id).filter(
+                cls.token_hash == token_hash,
+                cls.revoked_at.is_not(None),
+            ).first()
+            if stale is not None:
+                cls.revoke_family(db, stale.family_id)
+            return None
+
+        new_token = cls.issue(db, consumed.user_id, family_id=consumed.family_id)
+        return new_token, consumed.user_id
+
+    @classmethod
+    def revoke(cls, db, raw_token: str) -> bool:
+        """Revoke the family the given token belongs to. Returns True if found."""
+        token_hash = hash_refresh_token(raw_token)
+        refresh_token_buffer.flush_if_pending(token_hash)
+        row = db.query(cls.family_id).filter(cls.token_hash == token_hash).first()
+        if row is None:
+            return False
+        cls.revoke_family(db, row.family_id)
+        return True
+
+    @classmethod
+    def revoke_family(cls, db, family_id: uuid.UUID) -> None:
+        """Mark every live token in a family as revoked."""
+        db.execute(
+            update(cls)
+            .where(cls.family_id == family_id, cls.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
@@ -0,0 +1,32 @@
+# app/models/revoked_token.py
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime, delete, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class RevokedToken(Base):
+    """
+    ``jti`` of an access token revoked before its expiry.
+
+    Rows only need to live until the token would have expired anyway, after
+    which ``purge_expired`` removes them.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # Database clock, so every worker's incremental refresh uses one timeline
+    revoked_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, expires_at={self.expires_at})>"
+
+    @classmethod
+    def purge_expired(cls, db) -> int:
+        """Delete rows for tokens that have expired and return how many."""
+        result = db.execute(delete(cls).where(cls.expires_at < datetime.utcnow()))
+        return result.rowcount
@@ -1,27 +1,45 @@
 # app/models/user.py
 from datetime import datetime, timedelta
+from functools import lru_cache
 import uuid
 from typing import Optional, Dict, Any
 
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, Index, func, select
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.exc import IntegrityError
-from passlib.context import CryptContext
-from jose import JWTError, jwt
 from pydantic import ValidationError
 
 from app.database import Base
+from app.auth.last_login import last_login_buffer
+from app.auth.revocation import token_revocation_list
+from app.metrics import track_bcrypt
+from app.tracing import tracer
+from app.models.refresh_token import RefreshToken
 from app.schemas.base import UserCreate
 from app.schemas.user import UserResponse, Token
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib and python-jose are imported on first use, so processes that never
+# hash a password or touch a token don't pay for loading them
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Return the shared bcrypt CryptContext, creating it on first call."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Move to config
 SECRET_KEY = "your-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+def _insert_for(db):
+    """Return the dialect-specific ``insert`` that supports ON CONFLICT."""
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
 class User(Base):
     __tablename__ = 'users'
 
@@ -40,36 +58,87 @@ class User(Base):
     # Relationship to calculations
     calculations = relationship("Calculation", back_populates="user", cascade="all, delete-orphan")
 
+    # Case-insensitive unique indexes that back the login lookup
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+        Index("ix_users_username_lower", func.lower(username), unique=True),
+    )
+
     def __repr__(self):
         return f"<User(name={self.first_name} {self.last_name}, email={self.email})>"
 
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using bcrypt."""
-        return pwd_context.hash(password)
+        with track_bcrypt("hash"), tracer.span("bcrypt.hash"):
+            return get_pwd_context().hash(password)
 
     def verify_password(self, plain_password: str) -> bool:
         """Verify a plain password against the hashed password."""
-        return pwd_context.verify(plain_password, self.password_hash)
+        with track_bcrypt("verify"), tracer.span("bcrypt.verify"):
+            return get_pwd_context().verify(plain_password, self.password_hash)
 
     @staticmethod
     def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """Create a JWT access token."""
+        from jose import jwt
+
         to_encode = data.copy()
         expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
         to_encode.update({"exp": expire})
+        to_encode.setdefault("jti", uuid.uuid4().hex)  # lets the token be revoked before it expires
         return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     @staticmethod
-    def verify_token(token: str) -> Optional[UUID]:
-        """Verify and decode a JWT token."""
+    def decode_token(token: str) -> Optional[Dict[str, Any]]:
+        """Decode a JWT and return its claims, or None if it is invalid or expired."""
+        from jose import JWTError, jwt
+
+        try:
+            return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+
+    @staticmethod
+    def verify_token(token: str, db=None) -> Optional[UUID]:
+        """
+        Verify and decode a JWT token, rejecting revoked tokens.
+
+        A revocation filter hit is confirmed through ``db``; without a session
+        the hit alone rejects the token.
+        """
+        payload = User.decode_token(token)
+        if payload is None:
+            return None
+        jti = payload.get("jti")
+        if jti:
+            revoked = (
+                token_revocation_list.is_revoked(jti, db) if db is not None
+                else token_revocation_list.might_be_revoked(jti)
+            )
+            if revoked:
+                return None
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             user_id = payload.get("sub")
             return uuid.UUID(user_id) if user_id else None
-        except (JWTError, ValueError):
+        except ValueError:
             return None
 
+    @classmethod
+    def revoke_access_token(cls, db, token: str) -> bool:
+        """Revoke an access token until its expiry. Returns False if it cannot be decoded."""
+        payload = cls.decode_token(token)
+        if payload is None or not payload.get("jti"):
+            return False
+        user_id = payload.get("sub")
+        token_revocation_list.revoke(
+            db,
+            payload["jti"],
+            expires_at=datetime.utcfromtimestamp(payload["exp"]),
+            user_id=uuid.UUID(user_id) if user_id else None,
+        )
+        return True
+
     @classmethod
     def register(cls, db, user_data: Dict[str, Any]) -> "User":
         """Register a new user with validation."""
@@ -79,31 +148,31 @@ class User(Base):
             if len(password) < 6:  # Strictly less than 6 characters
                 raise ValueError("Password must be at least 6 characters long")
             
-            # Check if email/username exists
-            existing_user = db.query(cls).filter(
-                (cls.email == user_data.get('email')) |
-                (cls.username == user_data.get('username'))
-            ).first()
-            
-            if existing_user:
-                raise ValueError("Username or email already exists")
-
             # Validate using Pydantic schema
             user_create = UserCreate.model_validate(user_data)
-            
-            # Create new user instance
-            new_user = cls(
-                first_name=user_create.first_name,
-                last_name=user_create.last_name,
-                email=user_create.email,
-                username=user_create.username,
-                password_hash=cls.hash_password(user_create.password),
-                is_active=True,
-                is_verified=False
+
+            # Single INSERT ... ON CONFLICT DO NOTHING RETURNING: the unique
+            # constraints on email/username decide whether the row is new, so
+            # there is no separate existence SELECT and no check-then-insert race.
+            stmt = (
+                _insert_for(db)(cls)
+                .values(
+                    first_name=user_create.first_name,
+                    last_name=user_create.last_name,
+                    email=user_create.email,
+                    username=user_create.username,
+                    password_hash=cls.hash_password(user_create.password),
+                    is_active=True,
+                    is_verified=False
+                )
+                .on_conflict_do_nothing()
+                .returning(cls)
             )
-            
-            db.add(new_user)
-            db.flush()
+            new_user = db.scalars(stmt).first()
+
+            if new_user is None:
+                raise ValueError("Username or email already exists")
+
             return new_user
             
         except ValidationError as e:
@@ -111,25 +180,81 @@ class User(Base):
         except ValueError as e:
             raise e
 
+    @classmethod
+    def login_lookup(cls, identifier: str, by_email: Optional[bool] = None):
+        """
+        Build the SELECT for a username-or-email login.
+
+        Each statement filters on exactly one of the ``lower()`` functional
+        indexes instead of OR-ing both columns, so PostgreSQL can use a plain
+        index scan. ``by_email`` defaults to whether the identifier has an "@".
+        """
+        if by_email is None:
+            by_email = "@" in identifier
+        column = cls.email if by_email else cls.username
+        return select(cls).where(func.lower(column) == identifier.lower())
+
     @classmethod
     def authenticate(cls, db, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user and return token with user data."""
-        user = db.query(cls).filter(
-            (cls.username == username) | (cls.email == username)
-        ).first()
+        token_response = cls.login(db, username, password)
+        if not token_response:
+            return None
+        with tracer.span("serialize"):
+            return token_response.model_dump()
+
+    @classmethod
+    def login(cls, db, username: str, password: str) -> Optional[Token]:
+        """Authenticate user and return the validated ``Token`` model (no dict round trip)."""
+        with tracer.span("db.user_lookup"):
+            user = db.scalars(cls.login_lookup(username)).first()
+            if user is None and "@" in username:
+                # Usernames are not forbidden from containing "@"
+                user = db.scalars(cls.login_lookup(username, by_email=False)).first()
 
         if not user or not user.verify_password(password):
             return None # pragma: no cover
 
-        user.last_login = datetime.utcnow()
+        # Write-behind: the timestamp is flushed in a later batched UPDATE,
+        # so the login request never rewrites the users row.
+        with tracer.span("last_login.record"):
+            last_login_buffer.record(user.id)
+
+        # Refresh token lets the client renew access without another bcrypt
+        # verify; it is inserted behind the request too, so login does no write
+        with tracer.span("refresh_token.issue"):
+            refresh_token = RefreshToken.issue_deferred(user.id)
+        return cls._token_response(user, refresh_token)
+
+    @classmethod
+    def refresh(cls, db, refresh_token: str) -> Optional[Token]:
+        """Rotate a refresh token and return a new access/refresh token pair."""
+        rotated = RefreshToken.rotate(db, refresh_token)
+        if rotated is None:
+            db.commit()  # persist a family revocation triggered by token reuse
+            return None
+
+        new_refresh_token, user_id = rotated
+        user = db.get(cls, user_id)
+        if user is None or not user.is_active:
+            db.rollback()
+            return None
+
+        token_response = cls._token_response(user, new_refresh_token)
         db.commit()
+        return token_response
 
-        # Create token response using Pydantic models
-        user_response = UserResponse.model_validate(user)
-        token_response = Token(
-            access_token=cls.create_access_token({"sub": str(user.id)}),
+    @classmethod
+    def _token_response(cls, user: "User", refresh_token: str) -> Token:
+        # The user is validated once here; the token fields are produced by us,
+        # so the wrapper is constructed without another validation pass.
+        with tracer.span("validate.user_response"):
+            user_response = UserResponse.model_validate(user)
+        with tracer.span("jwt.encode"):
+            access_token = cls.create_access_token({"sub": str(user.id)})
+        return Token.model_construct(
+            access_token=access_token,
+            refresh_token=refresh_token,
             token_type="bearer",
             user=user_response
         )
-
-        return token_response.model_dump()
\ No newline at end of file
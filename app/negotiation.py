@@ -0,0 +1,90 @@
+# app/negotiation.py
+
+from typing import Any, Callable, Dict, Optional
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.responses import MsgPackResponse, PydanticJSONResponse
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+
+def _media_type(value: str) -> str:
+    return value.split(";", 1)[0].strip().lower()
+
+
+def wants_msgpack(request: Request) -> bool:
+    """
+    True if the Accept header prefers MessagePack over JSON.
+
+    Only explicit media types count: a missing header, ``*/*`` or a tie that
+    lists JSON first all keep JSON as the default.
+    """
+    accept = request.headers.get("accept")
+    if not accept or "msgpack" not in accept:
+        return False
+
+    best_type, best_q = JSON_MEDIA_TYPE, 0.0
+    for part in accept.split(","):
+        media_type, *params = [p.strip() for p in part.split(";")]
+        media_type = media_type.lower()
+        if media_type not in MSGPACK_MEDIA_TYPES and media_type != JSON_MEDIA_TYPE:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best_type, best_q = media_type, q
+    return best_type in MSGPACK_MEDIA_TYPES
+
+
+def negotiated_response(
+    request: Request, content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Render ``content`` as MessagePack or JSON according to the Accept header."""
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if wants_msgpack(request):
+        return MsgPackResponse(content, status_code=status_code, headers=headers)
+    return PydanticJSONResponse(content, status_code=status_code, headers=headers)
+
+
+class MsgPackRequest(Request):
+    """Request whose MessagePack body is exposed to FastAPI through ``json()``."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body(), raw=False)
+        return self._json
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route that also accepts ``Content-Type: application/msgpack`` bodies.
+
+    The body is decoded once with msgpack and handed to FastAPI's normal
+    body validation in place of parsed JSON. Requests with any other
+    content type are passed through untouched.
+    """
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = request.headers.get("content-type")
+            if content_type and _media_type(content_type) in MSGPACK_MEDIA_TYPES:
+                scope = dict(request.scope)
+                # FastAPI only calls request.json() for JSON content types
+                scope["headers"] = [
+                    (name, value) for name, value in request.scope["headers"] if name != b"content-type"
+                ] + [(b"content-type", JSON_MEDIA_TYPE.encode())]
+                request = MsgPackRequest(scope, request.receive)
+            return await original_route_handler(request)
+
+        return route_handler
@@ -0,0 +1,118 @@
+# app/pages.py
+
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from app.compression import brotli, choose_encoding, compress_body
+from app.conditional import if_none_match
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PAGES = ("index.html", "register.html", "login.html")
+
+
+@dataclass
+class RenderedPage:
+    """One rendered template: identity bytes plus precompressed variants."""
+
+    body: bytes
+    etag: str
+    mtime: float
+    variants: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag_for(self, encoding: Optional[str]) -> str:
+        # Same convention as CompressionMiddleware: compressed variants carry
+        # the weak form of the identity ETag
+        return self.etag if encoding is None else f"W/{self.etag}"
+
+
+class PageCache:
+    """
+    Rendered template pages held in memory.
+
+    The pages do not depend on the request, so each one is rendered once,
+    compressed once at the highest gzip/brotli levels, and then served as
+    bytes with an ETag and Cache-Control. With ``auto_reload`` (dev mode) a
+    page is re-rendered when its template file changes on disk.
+    """
+
+    def __init__(
+        self,
+        directory: str = "templates",
+        auto_reload: bool = settings.TEMPLATE_AUTO_RELOAD,
+        cache_control: str = settings.PAGE_CACHE_CONTROL,
+        gzip_level: int = 9,
+        brotli_quality: int = 11,
+    ):
+        self.directory = directory
+        self.auto_reload = auto_reload
+        self.cache_control = cache_control
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._pages: Dict[str, RenderedPage] = {}
+        self._env = None
+        self._lock = threading.Lock()
+
+    def load(self, names: Iterable[str] = PAGES) -> None:
+        """Render and compress ``names`` up front, e.g. at startup."""
+        for name in names:
+            self.get(name)
+
+    def get(self, name: str) -> RenderedPage:
+        """Return the rendered page, rendering it on first use or after a template change."""
+        page = self._pages.get(name)
+        if page is not None and not (self.auto_reload and self._mtime(name) != page.mtime):
+            return page
+        with self._lock:
+            page = self._pages.get(name)
+            mtime = self._mtime(name)
+            if page is None or (self.auto_reload and mtime != page.mtime):
+                page = self._render(name, mtime)
+                self._pages[name] = page
+        return page
+
+    def response(self, request: Request, name: str) -> Response:
+        """Serve ``name`` in the best encoding the client accepts, or 304 if unchanged."""
+        page = self.get(name)
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding not in page.variants:
+            encoding = None
+        etag = page.etag_for(encoding)
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if if_none_match(request, etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+            return Response(page.variants[encoding], media_type="text/html; charset=utf-8", headers=headers)
+        return Response(page.body, media_type="text/html; charset=utf-8", headers=headers)
+
+    def _render(self, name: str, mtime: float) -> RenderedPage:
+        body = self._environment().get_template(name).render().encode("utf-8")
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        page = RenderedPage(body=body, etag=f'"{digest}"', mtime=mtime)
+        encodings = ("br", "gzip") if brotli is not None else ("gzip",)
+        for encoding in encodings:
+            page.variants[encoding] = compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+        logger.info("Rendered page %s: %d bytes", name, len(body))
+        return page
+
+    def _environment(self):
+        if self._env is None:
+            # Jinja2 is only imported once a page is actually rendered
+            from jinja2 import Environment, FileSystemLoader, select_autoescape
+            self._env = Environment(
+                loader=FileSystemLoader(self.directory),
+                autoescape=select_autoescape(),
+                auto_reload=self.auto_reload,
+            )
+        return self._env
+
+    def _mtime(self, name: str) -> float:
+        return os.stat(os.path.join(self.directory, name)).st_mtime
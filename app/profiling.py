@@ -0,0 +1,234 @@
+# app/profiling.py
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[str, str, int]  # function name, file, first line
+
+FORMATS = {
+    "speedscope": ("application/json", "speedscope.json"),
+    "collapsed": ("text/plain; charset=utf-8", "collapsed.txt"),
+}
+
+
+def _signature(secret: str, method: str, path: str, expires: int) -> str:
+    message = f"{expires}:{method.upper()} {path}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_profile_request(secret: str, method: str, path: str, ttl: int = 300) -> str:
+    """Value for ``X-Profile-Signature`` allowing one route to be profiled for ``ttl`` seconds."""
+    expires = int(time.time()) + ttl
+    return f"{expires}.{_signature(secret, method, path, expires)}"
+
+
+def verify_profile_signature(secret: str, method: str, path: str, value: str) -> bool:
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, method, path, int(expires)))
+
+
+class SamplingProfiler:
+    """
+    Samples one thread's stack every ``interval`` seconds from a helper thread.
+
+    Async handlers run on the event loop thread, so sampling that thread
+    shows where a request spends its time, including sync calls that block
+    the loop. Time the loop spends idle (awaiting I/O) shows up under the
+    selector. Other requests interleaved on the same loop are sampled too.
+    """
+
+    def __init__(self, interval: float = settings.PROFILING_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples: List[Tuple[Tuple[Frame, ...], float]] = []
+        self.duration = 0.0
+        self._target: Optional[int] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _sample(self) -> None:
+        last = time.perf_counter()
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.samples.append((tuple(reversed(stack)), now - last))
+            last = now
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: ``root;...;leaf count`` per line."""
+        counts = Counter(
+            ";".join(f"{name} ({os.path.basename(file)}:{line})" for name, file, line in stack)
+            for stack, _ in self.samples
+        )
+        return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+    def speedscope(self, name: str) -> Dict:
+        """A sampled profile in speedscope's file format, weighted in seconds."""
+        frames: Dict[Frame, int] = {}
+        samples = []
+        for stack, _ in self.samples:
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "exporter": "calculator-profiler",
+            "name": name,
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": n, "file": f, "line": l} for n, f, l in frames]},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": samples,
+                "weights": [weight for _, weight in self.samples],
+            }],
+        }
+
+    def render(self, fmt: str, name: str) -> bytes:
+        if fmt == "collapsed":
+            return self.collapsed().encode()
+        return json.dumps(self.speedscope(name)).encode()
+
+
+class ProfilingMiddleware:
+    """
+    Runs a request under ``SamplingProfiler`` when asked to.
+
+    A request is profiled when it sends ``X-Profile: 1`` with an
+    ``X-Profile-Signature`` made by ``sign_profile_request`` using
+    ``secret``, or on every request when ``profile_all`` (the operator's
+    switch) is on. ``X-Profile-Format`` picks ``speedscope`` (default) or
+    ``collapsed``. With ``output_dir`` set the profile is written there and
+    named in ``X-Profile-Id``; otherwise it replaces the response body and
+    the handler's status is sent as ``X-Profile-Status``.
+
+    ``create_app`` only installs this middleware when profiling is
+    configured, so it adds nothing to requests otherwise.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        secret: Optional[str] = settings.PROFILING_SECRET,
+        profile_all: bool = settings.PROFILE_ALL_REQUESTS,
+        interval: float = settings.PROFILING_INTERVAL_SECONDS,
+        output_dir: Optional[str] = settings.PROFILING_OUTPUT_DIR,
+    ):
+        self.app = app
+        self.secret = secret
+        self.profile_all = profile_all
+        self.interval = interval
+        self.output_dir = output_dir
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not self.should_profile(scope, headers):
+            await self.app(scope, receive, send)
+            return
+
+        fmt = headers.get("x-profile-format", "speedscope")
+        if fmt not in FORMATS:
+            fmt = "speedscope"
+        name = f"{scope['method']} {scope['path']}"
+        profile_id = uuid.uuid4().hex
+        profiler = SamplingProfiler(self.interval)
+
+        if self.output_dir:
+            async def store_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+                await send(message)
+
+            profiler.start()
+            try:
+                await self.app(scope, receive, store_send)
+            finally:
+                profiler.stop()
+                self.store(profiler, fmt, name, profile_id)
+            return
+
+        status = {}
+
+        async def capture_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture_send)
+        finally:
+            profiler.stop()
+        content_type, _ = FORMATS[fmt]
+        body = profiler.render(fmt, name)
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-id", profile_id.encode()),
+                (b"x-profile-status", str(status.get("code", 500)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def should_profile(self, scope: Scope, headers: Headers) -> bool:
+        if self.profile_all:
+            return True
+        if headers.get("x-profile") != "1" or not self.secret:
+            return False
+        signature = headers.get("x-profile-signature", "")
+        if verify_profile_signature(self.secret, scope["method"], scope["path"], signature):
+            return True
+        logger.warning("Ignoring X-Profile with a bad signature for %s %s", scope['method'], scope['path'])
+        return False
+
+    def store(self, profiler: SamplingProfiler, fmt: str, name: str, profile_id: str) -> None:
+        _, suffix = FORMATS[fmt]
+        path = os.path.join(self.output_dir, f"{profile_id}.{suffix}")
+        try:
+            with open(path, "wb") as f:
+                f.write(profiler.render(fmt, name))
+        except OSError as e:
+            logger.error("Failed to write profile %s: %s", path, e)
@@ -0,0 +1,32 @@
+# app/responses.py
+
+from typing import Any
+
+import msgpack
+from fastapi.responses import JSONResponse, Response
+from pydantic_core import to_json, to_jsonable_python
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    JSON response that writes already-validated Pydantic models straight to bytes.
+
+    Returning a Response from a route makes FastAPI skip its own
+    ``response_model`` validation and ``jsonable_encoder`` pass, so the model
+    built in the handler is validated exactly once and serialized once by
+    pydantic-core. ``response_model`` stays on the route for the OpenAPI docs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+class MsgPackResponse(Response):
+    """MessagePack counterpart of ``PydanticJSONResponse``."""
+
+    media_type = "application/msgpack"
+
+    def render(self, content: Any) -> bytes:
+        # Plain dicts/lists pack natively; models, UUIDs and datetimes fall back
+        # to the same plain values JSON would carry
+        return msgpack.packb(content, default=to_jsonable_python)
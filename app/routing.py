@@ -0,0 +1,117 @@
+# app/routing.py
+
+import time
+from inspect import iscoroutinefunction
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+
+from app.config import Settings, settings
+from app.metrics import IN_PROGRESS, REQUEST_LATENCY, REQUESTS
+from app.negotiation import NegotiatedRoute
+from app.tracing import tracer
+
+
+class InstrumentedRoute(NegotiatedRoute):
+    """
+    Route that records request count, latency and in-flight requests.
+
+    The route template (``/calculations/{id}``) is the label, so ids never
+    create new series. Label children are resolved once per route rather
+    than per request. With ``METRICS_ENABLED`` off the plain handler is used
+    and the hot path pays nothing.
+
+    When tracing is enabled each request also gets a root span split into
+    ``request.validate`` (body parsing, validation, dependencies), the
+    endpoint, and ``response.render`` (response model serialization).
+
+    Both switches are read once, when the route is built: from the settings
+    of the app ``create_app`` mounts it on, else from the global settings.
+    """
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        methods = sorted(self.methods or ["GET"])
+        method = methods[0] if len(methods) == 1 else "|".join(methods)
+        route_settings = self._app_settings()
+        if route_settings.TRACING_ENABLED:
+            route_handler = self._traced(route_handler, method)
+        if not route_settings.METRICS_ENABLED:
+            return route_handler
+
+        latency = REQUEST_LATENCY.labels(method, self.path)
+        in_progress = IN_PROGRESS.labels(method, self.path)
+        counters = {}
+
+        def count(status_code: int) -> None:
+            counter = counters.get(status_code)
+            if counter is None:
+                counter = counters[status_code] = REQUESTS.labels(method, self.path, str(status_code))
+            counter.inc()
+
+        async def instrumented_handler(request: Request) -> Response:
+            in_progress.inc()
+            started = time.perf_counter()
+            status_code = 500
+            try:
+                response = await route_handler(request)
+                status_code = response.status_code
+                return response
+            except HTTPException as exc:
+                status_code = exc.status_code
+                raise
+            except RequestValidationError:
+                status_code = 400  # what main.py's validation_exception_handler answers
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started)
+                count(status_code)
+                in_progress.dec()
+
+        return instrumented_handler
+
+    def _app_settings(self) -> Settings:
+        # FastAPI passes the app itself as the dependency overrides provider
+        # of the routes it includes, and create_app sets its settings first
+        app = self.dependency_overrides_provider
+        return getattr(getattr(app, "state", None), "settings", None) or settings
+
+    def _traced(self, route_handler: Callable, method: str) -> Callable:
+        # FastAPI has already checked whether the endpoint is a coroutine
+        # function, so the wrapper must keep its sync/async kind
+        endpoint = self.dependant.call
+        name = f"{method} {self.path}"
+
+        if iscoroutinefunction(endpoint):
+            async def traced_endpoint(**values):
+                tracer.enter_phase(None)
+                with tracer.span("endpoint", **{"code.function": endpoint.__name__}):
+                    result = await endpoint(**values)
+                tracer.enter_phase("response.render")
+                return result
+        else:
+            def traced_endpoint(**values):
+                tracer.enter_phase(None)
+                with tracer.span("endpoint", **{"code.function": endpoint.__name__}):
+                    result = endpoint(**values)
+                tracer.enter_phase("response.render")
+                return result
+
+        self.dependant.call = traced_endpoint
+
+        async def traced_handler(request: Request) -> Response:
+            with tracer.request(
+                name,
+                traceparent=request.headers.get("traceparent"),
+                **{"http.request.method": request.method, "http.route": self.path},
+            ) as span:
+                try:
+                    response = await route_handler(request)
+                except HTTPException as exc:
+                    span.set_attribute("http.response.status_code", exc.status_code)
+                    raise
+                span.set_attribute("http.response.status_code", response.status_code)
+                return response
+
+        return traced_handler
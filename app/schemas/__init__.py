@@ -1,7 +1,7 @@
 # app/schemas/__init__.py
 
 from .base import UserBase, PasswordMixin, UserCreate, UserLogin
-from .user import UserResponse, Token, TokenData
+from .user import UserResponse, Token, TokenData, RefreshTokenRequest
 
 __all__ = [
     "UserBase",
@@ -11,4 +11,5 @@ __all__ = [
     "UserResponse",
     "Token",
     "TokenData",
+    "RefreshTokenRequest",
 ]
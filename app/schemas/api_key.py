@@ -0,0 +1,37 @@
+from typing import FrozenSet, List, Literal, Optional
+from uuid import UUID
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+
+ApiKeyScope = Literal["calculations:read", "calculations:write"]
+
+class ApiKeyCreate(BaseModel):
+    """Schema for creating an API key"""
+    name: str = Field(min_length=1, max_length=100, example="nightly-batch")
+    scopes: List[ApiKeyScope] = Field(default_factory=lambda: ["calculations:read", "calculations:write"])
+
+
+class ApiKeyRead(BaseModel):
+    """Schema for listing API keys (never includes the key itself)"""
+    id: UUID
+    name: str
+    prefix: str
+    scopes: List[str] = Field(validation_alias="scope_list")
+    created_at: datetime
+    revoked_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class ApiKeyCreated(ApiKeyRead):
+    """Schema returned once at creation, including the raw key"""
+    key: str
+
+
+class ApiKeyPrincipal(BaseModel):
+    """Identity resolved from a verified X-API-Key header"""
+    key_id: UUID
+    user_id: UUID
+    scopes: FrozenSet[str]
+
+    model_config = ConfigDict(frozen=True)
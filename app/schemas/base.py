@@ -1,9 +1,19 @@
-from pydantic import BaseModel, EmailStr, Field, ConfigDict, ValidationError, model_validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, Field, ConfigDict, ValidationError, WithJsonSchema, model_validator
+from typing import Annotated, Optional
 from uuid import UUID
 from datetime import datetime
 
 
+def _validate_email(value: str) -> str:
+    # Same checks and errors as pydantic's EmailStr, but email_validator is
+    # imported on the first validation instead of when the schema is built
+    from pydantic.networks import validate_email
+    return validate_email(value)[1]
+
+
+EmailStr = Annotated[str, AfterValidator(_validate_email), WithJsonSchema({"type": "string", "format": "email"})]
+
+
 class UserBase(BaseModel):
     """Base user schema with common fields"""
     first_name: str = Field(max_length=50, example="John")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, field_validator, Field, model_validator
-from typing import Optional, Literal
+from typing import Optional, Literal, Tuple
 
 CalcType = Literal["Add", "Sub", "Multiply", "Divide"]
 
@@ -46,3 +46,23 @@ class CalculationRead(BaseModel):
     result: Optional[float] = None
 
     model_config = {"from_attributes": True}
+
+# Field names a ``?fields=`` sparse field set may name, in response order
+CALCULATION_FIELDS = tuple(CalculationRead.model_fields)
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a ``fields=id,result`` query value into CalculationRead field names.
+
+    Returns None when no sparse field set was asked for. Names are
+    de-duplicated and put in response order; unknown names raise ValueError.
+    """
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        raise ValueError(f"fields must name at least one of {', '.join(CALCULATION_FIELDS)}")
+    unknown = requested.difference(CALCULATION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in CALCULATION_FIELDS if name in requested)
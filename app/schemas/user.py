@@ -1,7 +1,9 @@
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, ConfigDict
+
+from app.schemas.base import EmailStr
 
 class UserResponse(BaseModel):
     """Schema for user response data"""
@@ -21,6 +23,7 @@ class UserResponse(BaseModel):
 class Token(BaseModel):
     """Schema for authentication token response"""
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     user: UserResponse
 
@@ -28,6 +31,7 @@ class Token(BaseModel):
         json_schema_extra={
             "example": {
                 "access_token": "eyJ0eXAiOiJKV1QiLCJhbGciOiJIUzI1NiJ9...",
+                "refresh_token": "q3Zx9cJ1w1n8yQb5m0d2Lr7tV4sK6pHf0aE8uN2gY1o",
                 "token_type": "bearer",
                 "user": {
                     "id": "123e4567-e89b-12d3-a456-426614174000",
@@ -45,6 +49,11 @@ class Token(BaseModel):
     )
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token"""
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     """Schema for JWT token payload"""
     user_id: Optional[UUID] = None
@@ -0,0 +1,326 @@
+# app/tracing.py
+
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.config import Settings, settings
+from app.metrics import TRACES_DROPPED
+
+logger = logging.getLogger(__name__)
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """One timed operation; spans of a trace are exported together when the root ends."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns",
+                 "attributes", "status", "status_message", "sampled", "_trace")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool,
+                 kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex() if sampled else ""
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.status = STATUS_OK
+        self.status_message = ""
+        self.sampled = sampled
+        self._trace: List["Span"] = []
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.sampled:
+            self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        if not self.sampled:
+            return
+        self.attributes["exception.type"] = type(exc).__name__
+        # HTTPException 4xx are answers, not failures
+        if getattr(exc, "status_code", 500) >= 500:
+            self.status = STATUS_ERROR
+            self.status_message = str(exc)
+
+
+_UNSAMPLED = Span("unsampled", "", None, sampled=False)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_current_request: ContextVar[Optional[Dict[str, Optional[Span]]]] = ContextVar("current_request", default=None)
+
+
+def _attribute(key: str, value: Any) -> Dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class OTLPJsonFileExporter:
+    """
+    Appends each finished trace to ``path`` as one line of OTLP/JSON.
+
+    Every line is an ``ExportTraceServiceRequest``, the format the
+    OpenTelemetry Collector's ``otlpjsonfile`` receiver (and most OTLP
+    tooling) reads, so traces can be shipped to Jaeger/Tempo later.
+
+    ``export`` only queues the spans; a background thread, started on the
+    first export, encodes and writes whatever is queued and flushes the file
+    once per batch. When ``queue_size`` traces are already waiting, new ones
+    are dropped and counted rather than blocking the request.
+    """
+
+    def __init__(self, path: str, service_name: str = settings.TRACING_SERVICE_NAME,
+                 queue_size: int = settings.TRACING_QUEUE_SIZE):
+        self.path = path
+        self.service_name = service_name
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max(queue_size, 0))
+        self._file = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            TRACES_DROPPED.inc()
+
+    def flush(self) -> None:
+        """Block until every queued trace has been written."""
+        self._queue.join()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            traces = [spans for spans in batch if spans is not None]
+            try:
+                if traces:
+                    self._write(traces)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(traces) < len(batch):
+                return
+
+    def _write(self, traces: List[List[Span]]) -> None:
+        lines = "".join(json.dumps(self.encode(spans), separators=(",", ":")) + "\n" for spans in traces)
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(lines)
+            self._file.flush()
+        except OSError as e:
+            logger.error("Failed to export traces to %s: %s", self.path, e)
+
+    def encode(self, spans: List[Span]) -> Dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{
+                "scope": {"name": __name__},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": span.kind,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns),
+                    "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+                    "status": {"code": span.status, "message": span.status_message},
+                } for span in spans],
+            }],
+        }]}
+
+    def shutdown(self) -> None:
+        """Write out what is queued, stop the writer thread and close the file."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def parse_traceparent(value: Optional[str]):
+    """``(trace_id, parent_span_id, sampled)`` from a W3C traceparent header, or None."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        sampled = bool(int(parts[3], 16) & 1)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], sampled
+
+
+class Tracer:
+    """
+    Minimal tracer producing OpenTelemetry-shaped spans.
+
+    Sampling is decided once per trace at the root: an incoming
+    ``traceparent`` header's sampled flag wins, otherwise ``sample_rate``.
+    Spans below an unsampled root cost a context-variable lookup. With
+    ``enabled`` off, ``span()`` does nothing at all.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.TRACING_ENABLED,
+        sample_rate: float = settings.TRACING_SAMPLE_RATE,
+        exporter: Optional[OTLPJsonFileExporter] = None,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        if enabled and exporter is None:
+            self.exporter = OTLPJsonFileExporter(settings.TRACING_EXPORT_PATH)
+
+    def configure(self, app_settings: Settings) -> None:
+        """
+        Apply an app's ``TRACING_*`` settings, replacing the exporter.
+
+        Whether routes are wrapped for tracing at all is decided when
+        ``create_app`` mounts them, from the same settings.
+        """
+        self.shutdown()
+        self.enabled = app_settings.TRACING_ENABLED
+        self.sample_rate = app_settings.TRACING_SAMPLE_RATE
+        self.exporter = None
+        if self.enabled:
+            self.exporter = OTLPJsonFileExporter(
+                app_settings.TRACING_EXPORT_PATH,
+                service_name=app_settings.TRACING_SERVICE_NAME,
+                queue_size=app_settings.TRACING_QUEUE_SIZE,
+            )
+
+    def start_span(self, name: str, parent: Optional[Span] = None, kind: int = SPAN_KIND_INTERNAL,
+                   traceparent: Optional[str] = None, **attributes) -> Span:
+        parent = parent if parent is not None else _current_span.get()
+        if parent is not None:
+            if not parent.sampled:
+                return _UNSAMPLED
+            span = Span(name, parent.trace_id, parent.span_id, True, kind, attributes)
+            span._trace = parent._trace
+            return span
+
+        remote = parse_traceparent(traceparent)
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id, parent_id, sampled = None, None, random.random() < self.sample_rate
+        if not sampled:
+            return _UNSAMPLED
+        span = Span(name, trace_id or os.urandom(16).hex(), parent_id, True, kind, attributes)
+        span._trace = [span]
+        return span
+
+    def end_span(self, span: Span) -> None:
+        if not span.sampled or span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if span._trace and span._trace[0] is span:
+            if self.exporter is not None:
+                self.exporter.export(span._trace)
+        else:
+            span._trace.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Time the block as a child of the current span."""
+        if not self.enabled:
+            yield _UNSAMPLED
+            return
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end_span(span)
+
+    @contextmanager
+    def request(self, name: str, traceparent: Optional[str] = None, **attributes):
+        """
+        Root span for one request, starting in the ``request.validate`` phase.
+
+        Body parsing, Pydantic validation and dependencies (e.g.
+        ``get_current_user``) run in that phase until ``enter_phase`` moves
+        the request on, which the traced endpoint wrapper does.
+        """
+        if not self.enabled:
+            yield _UNSAMPLED
+            return
+        root = self.start_span(name, kind=SPAN_KIND_SERVER, traceparent=traceparent, **attributes)
+        state = None
+        if root.sampled:
+            state = {"root": root, "phase": self.start_span("request.validate", parent=root)}
+        span_token = _current_span.set(state["phase"] if state else root)
+        request_token = _current_request.set(state)
+        try:
+            yield root
+        except BaseException as exc:
+            root.record_exception(exc)
+            raise
+        finally:
+            if state is not None and state["phase"] is not None:
+                self.end_span(state["phase"])
+            _current_request.reset(request_token)
+            _current_span.reset(span_token)
+            self.end_span(root)
+
+    def enter_phase(self, name: Optional[str]) -> None:
+        """End the current request phase and start ``name`` (None: back to the root)."""
+        state = _current_request.get()
+        if state is None:
+            return
+        if state["phase"] is not None:
+            self.end_span(state["phase"])
+        root = state["root"]
+        state["phase"] = self.start_span(name, parent=root) if name else None
+        _current_span.set(state["phase"] or root)
+
+    def shutdown(self) -> None:
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+tracer = Tracer()
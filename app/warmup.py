@@ -0,0 +1,127 @@
+# app/warmup.py
+
+import logging
+import time
+import uuid
+from typing import Callable, Dict
+
+from app.config import settings
+from app.database import get_session_factory, prewarm_pool
+from app.models.calculation import Calculation
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.responses import MsgPackResponse, PydanticJSONResponse
+from app.schemas.api_key import ApiKeyCreate
+from app.schemas.base import UserCreate
+from app.schemas.base import UserLogin as ValidatedUserLogin
+from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate
+from app.schemas.user import RefreshTokenRequest, Token, UserLogin, UserResponse
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE_USER = {
+    "id": "123e4567-e89b-12d3-a456-426614174000",
+    "username": "warmup",
+    "email": "warmup@example.com",
+    "first_name": "Warm",
+    "last_name": "Up",
+    "is_active": True,
+    "is_verified": False,
+    "created_at": "2025-01-01T00:00:00",
+    "updated_at": "2025-01-01T00:00:00",
+}
+
+# One valid payload per request and response schema on the hot paths
+SAMPLE_PAYLOADS = (
+    (UserCreate, {"first_name": "Warm", "last_name": "Up", "email": "warmup@example.com",
+                  "username": "warmup", "password": "WarmUp123"}),
+    (UserLogin, {"username": "warmup", "password": "WarmUp123"}),
+    (ValidatedUserLogin, {"username": "warmup", "password": "WarmUp123"}),
+    (RefreshTokenRequest, {"refresh_token": "warmup"}),
+    (CalculationCreate, {"a": 1.0, "b": 2.0, "type": "Add"}),
+    (CalculationUpdate, {"a": 1.0, "type": "Divide"}),
+    (ApiKeyCreate, {"name": "warmup"}),
+    (UserResponse, _SAMPLE_USER),
+    (Token, {"access_token": "warmup", "refresh_token": "warmup", "token_type": "bearer", "user": _SAMPLE_USER}),
+)
+
+# A row as the calculation handlers get it from fetch_page/fetch_one_versioned
+_SAMPLE_CALCULATION = {"id": 1, "a": 1.0, "b": 2.0, "type": "Add", "result": 3.0}
+
+
+def warm_statements(engine) -> None:
+    """
+    Run the hot SELECT/UPDATE statements once, matching nothing, in a
+    transaction that is rolled back, so their compiled forms are in the
+    engine's statement cache before the first request needs them.
+    """
+    db = get_session_factory()(bind=engine)
+    try:
+        db.scalars(User.login_lookup("warmup")).first()
+        db.scalars(User.login_lookup("warmup@example.com")).first()
+        db.query(User).filter(User.id == uuid.UUID(int=0)).first()
+        Calculation.fetch_page_versioned(db, 0, 1)
+        Calculation.fetch_one_versioned(db, 0)
+        RefreshToken.rotate(db, "warmup")
+    finally:
+        db.rollback()
+        db.close()
+
+
+def warm_schemas() -> None:
+    """
+    Validate and serialize a sample through every hot schema (and import
+    email_validator), then render the calculation rows and models the
+    handlers return through both negotiated response classes.
+    """
+    for schema, payload in SAMPLE_PAYLOADS:
+        schema.model_validate(payload).model_dump_json()
+    calculation = CalculationRead.model_validate(_SAMPLE_CALCULATION)
+    for response_class in (PydanticJSONResponse, MsgPackResponse):
+        response_class([_SAMPLE_CALCULATION])
+        response_class(calculation)
+
+
+def warm_bcrypt() -> None:
+    """Load passlib and the bcrypt backend with one hash and one verify."""
+    user = User(password_hash=User.hash_password("WarmUp123"))
+    user.verify_password("WarmUp123")
+
+
+def warm_tokens() -> None:
+    """Load python-jose with one JWT encode/decode."""
+    User.decode_token(User.create_access_token({"sub": str(uuid.UUID(int=0))}))
+
+
+def warm_up(engine, steps: str = settings.WARMUP_STEPS,
+            connections: int = settings.DB_WARMUP_CONNECTIONS) -> Dict[str, float]:
+    """
+    Pay the first-request costs of a new worker before it takes traffic.
+
+    Runs the comma-separated ``steps`` in order and returns each one's
+    duration in milliseconds. A failing step is logged, not raised, so a
+    database that is down does not keep the worker from starting;
+    readiness reports it.
+    """
+    actions: Dict[str, Callable[[], object]] = {
+        "pool": lambda: prewarm_pool(engine, connections),
+        "statements": lambda: warm_statements(engine),
+        "schemas": warm_schemas,
+        "bcrypt": warm_bcrypt,
+        "tokens": warm_tokens,
+    }
+    timings = {}
+    for step in filter(None, (name.strip() for name in steps.split(","))):
+        action = actions.get(step)
+        if action is None:
+            logger.warning("Unknown warmup step %r skipped", step)
+            continue
+        started = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            logger.warning("Warmup step %s failed: %s", step, e)
+        timings[step] = round((time.perf_counter() - started) * 1000, 2)
+    if timings:
+        logger.info("Warmup finished in %.0f ms: %s", sum(timings.values()), timings)
+    return timings
@@ -0,0 +1,123 @@
+# app/write_behind.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """
+    Queue of pending rows written by a background thread in batches.
+
+    Requests only put a row in memory under a key (a later row with the same
+    key replaces the earlier one); the thread hands the whole batch to
+    ``write`` at most every ``flush_interval`` seconds, or sooner once
+    ``max_pending`` rows are queued. Subclasses implement ``write``.
+
+    A batch being written still counts as pending until it is committed,
+    and only one flush runs at a time, so a caller that flushes because its
+    key ``is_pending`` returns only once that row is in the database.
+    """
+
+    name = "write-behind"
+
+    def __init__(self, flush_interval: float, max_pending: int, session_factory: Optional[Callable] = None):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._session_factory = session_factory
+        self._pending: Dict[Hashable, Any] = {}
+        self._writing: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, db, batch: Dict[Hashable, Any]) -> None:
+        """Write ``batch`` through ``db``; the caller commits."""
+        raise NotImplementedError
+
+    def put(self, key: Hashable, row: Any) -> None:
+        """Queue ``row`` under ``key``."""
+        with self._lock:
+            self._pending[key] = row
+            full = len(self._pending) >= self.max_pending
+        if full:
+            self._wakeup.set()
+
+    def pending(self) -> int:
+        """Number of rows not yet written."""
+        with self._lock:
+            return len(self._pending)
+
+    def is_pending(self, key: Hashable) -> bool:
+        """True if ``key`` is queued or in a batch that is not committed yet."""
+        with self._lock:
+            return key in self._pending or key in self._writing
+
+    def flush(self) -> int:
+        """
+        Write all pending rows in one transaction and return how many there were.
+
+        Waits for a flush already running in another thread first.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+                self._writing = batch
+            if not batch:
+                return 0
+
+            db = self._get_session_factory()()
+            try:
+                self.write(db, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                # Put the batch back unless newer rows have superseded it
+                with self._lock:
+                    for key, row in batch.items():
+                        self._pending.setdefault(key, row)
+                raise
+            finally:
+                db.close()
+                with self._lock:
+                    self._writing = {}
+            return len(batch)
+
+    def start(self) -> None:
+        """Start the background flusher thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write whatever is still pending."""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            logger.error("%s flush at shutdown failed: %s", self.name, e)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("%s flush failed: %s", self.name, e)
+
+    def _get_session_factory(self) -> Callable:
+        if self._session_factory is None:
+            from app.database import SessionLocal
+            return SessionLocal
+        return self._session_factory
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: caller-side cost of logging during an error storm.
+
+Logs ``--records`` copies of the ``HTTPException`` handler's error line and
+measures how long the *calling* thread (the event loop, in the app) spends
+per call (mean, p99 and max). The sink sleeps ``--sink-delay-us`` per write to stand in for a
+slow stdout (a container log pipe under pressure). Compared setups:
+
+  sync       StreamHandler writing in the caller, as ``logging.basicConfig``
+  queue      background writer with JSON records, no sampling
+  sampled    background writer with JSON records and per-route sampling
+
+Usage:
+    python -m benchmarks.bench_logging [--records N] [--sink-delay-us N]
+"""
+
+import argparse
+import logging
+import queue
+import time
+from logging.handlers import QueueListener
+
+
+class SlowSink:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> None:
+        time.sleep(self.delay)
+        self.lines += 1
+
+    def flush(self) -> None:
+        pass
+
+
+def storm(handler: logging.Handler, records: int) -> tuple:
+    logger = logging.getLogger("bench.storm")
+    logger.propagate = False
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    calls = []
+    for i in range(records):
+        before = time.perf_counter()
+        logger.error("HTTPException on %s: %s", f"/calculations/{i}", "Calculation not found",
+                     extra={"route": "/calculations/{id}"})
+        calls.append((time.perf_counter() - before) * 1e6)
+    calls.sort()
+    return sum(calls) / records, calls[int(records * 0.99)], calls[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--sink-delay-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    from app.logging_setup import JsonFormatter, NonBlockingQueueHandler, RepeatedErrorSampler
+
+    delay = args.sink_delay_us / 1e6
+    print(f"{args.records} error records, sink {args.sink_delay_us:.0f} us/write")
+    print(f"  {'setup':<8} {'mean us/call':>13} {'p99 us':>8} {'max us':>9} {'lines written':>14}")
+
+    sink = SlowSink(delay)
+    sync = logging.StreamHandler(sink)
+    sync.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    mean, p99, worst = storm(sync, args.records)
+    print(f"  {'sync':<8} {mean:13.2f} {p99:8.1f} {worst:9.1f} {sink.lines:14d}")
+
+    for name, sampled in (("queue", False), ("sampled", True)):
+        sink = SlowSink(delay)
+        writer = logging.StreamHandler(sink)
+        writer.setFormatter(JsonFormatter())
+        records = queue.SimpleQueue()
+        handler = NonBlockingQueueHandler(records, maxsize=args.records)
+        if sampled:
+            handler.addFilter(RepeatedErrorSampler())
+        listener = QueueListener(records, writer)
+        listener.start()
+        mean, p99, worst = storm(handler, args.records)
+        listener.stop()
+        print(f"  {name:<8} {mean:13.2f} {p99:8.1f} {worst:9.1f} {sink.lines:14d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: JSON vs MessagePack for calculation payloads.
+
+Reports encoded size and encode/decode time for a single calculation and a
+100-row browse page, using the same renderers the endpoints use.
+
+Usage:
+    python -m benchmarks.bench_msgpack [--iterations N]
+"""
+
+import argparse
+import json
+import time
+
+import msgpack
+
+from app.responses import MsgPackResponse, PydanticJSONResponse
+
+
+def timed(fn, iterations):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    row = {"id": 123456, "a": 1234.5678, "b": 2.0, "type": "Multiply", "result": 2469.1356}
+    payloads = {
+        "single calculation": row,
+        "100-row page": [dict(row, id=row["id"] + i) for i in range(100)],
+    }
+
+    for name, payload in payloads.items():
+        json_body = PydanticJSONResponse(payload).body
+        msgpack_body = MsgPackResponse(payload).body
+        print(name)
+        print(f"  size     json {len(json_body):7d} B   msgpack {len(msgpack_body):7d} B"
+              f"   ({len(msgpack_body) / len(json_body):.0%})")
+        print(f"  encode   json {timed(lambda: PydanticJSONResponse(payload).body, args.iterations):7.2f} us"
+              f"  msgpack {timed(lambda: MsgPackResponse(payload).body, args.iterations):7.2f} us")
+        print(f"  decode   json {timed(lambda: json.loads(json_body), args.iterations):7.2f} us"
+              f"  msgpack {timed(lambda: msgpack.unpackb(msgpack_body), args.iterations):7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory of a multi-worker server with and without preloading.
+
+Starts gunicorn with ``--workers`` uvicorn workers (app/gunicorn_conf.py),
+once with the app imported in each worker after the fork (as ``uvicorn
+--workers`` does) and once with ``--preload``, warmed and ``gc.freeze()``d
+in the master. After ``--requests`` requests it prints each process's RSS
+and USS (memory unique to it), and the footprint: master RSS plus the
+workers' USS.
+
+Workers connect to the database from ``DATABASE_URL`` on startup; one that
+is down is logged and does not change the comparison much.
+
+Usage:
+    python -m benchmarks.bench_preload [--workers N] [--requests N] [--port P] [--settle S]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def wait_until_serving(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to wait after the first worker answers")
+    args = parser.parse_args()
+
+    import psutil
+
+    from app.memory_report import memory_report, worker_memory
+
+    base = f"http://127.0.0.1:{args.port}"
+    footprints = {}
+    for label, flags in (("per-worker import", []), ("preload + gc.freeze", ["--preload"])):
+        master = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "main:app", "-c", "python:app.gunicorn_conf",
+             "--bind", f"127.0.0.1:{args.port}", "--workers", str(args.workers), *flags],
+            env={**os.environ, "DB_ECHO": "false", "LOG_LEVEL": "WARNING"},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_serving(f"{base}/health/live")
+            # The first worker up answered; give the others time to finish their lifespans
+            time.sleep(args.settle)
+            for i in range(args.requests):
+                urllib.request.urlopen(f"{base}/{('', 'login', 'register')[i % 3]}").read()
+            print(f"{label} ({args.workers} workers, {args.requests} requests):")
+            print(memory_report(master.pid))
+            workers = worker_memory(child.pid for child in psutil.Process(master.pid).children())
+            footprints[label] = worker_memory([master.pid])[0]["rss_mb"] + sum(r["uss_mb"] for r in workers)
+            print()
+        finally:
+            master.send_signal(signal.SIGTERM)
+            master.wait(timeout=60)
+
+    before, after = footprints.values()
+    print(f"footprint: {before:.1f} -> {after:.1f} MiB ({(1 - after / before) * 100:.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
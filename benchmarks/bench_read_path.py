@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: ORM vs Core read path for the calculation GET endpoints.
+
+Seeds calculations inside a transaction that is rolled back at the end, then
+measures rows per second for reading and serializing pages:
+
+- ORM: ``db.query(Calculation)`` + ``CalculationRead.model_validate`` per row + to_json
+- Core: ``Calculation.fetch_page`` (column SELECT, ``.tuples()``) + to_json
+
+Requires the database from ``DATABASE_URL``.
+
+Usage:
+    python -m benchmarks.bench_read_path [--rows N] [--page-size N] [--iterations N]
+"""
+
+import argparse
+import time
+
+from pydantic_core import to_json
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import Base
+from app.models.calculation import Calculation
+from app.models.user import User  # noqa: F401 - registers the mapper
+from app.schemas.calculation import CalculationRead
+
+
+def orm_page(db, skip, limit):
+    calculations = db.query(Calculation).order_by(Calculation.id).offset(skip).limit(limit).all()
+    return to_json([CalculationRead.model_validate(calculation) for calculation in calculations])
+
+
+def core_page(db, skip, limit):
+    return to_json(Calculation.fetch_page(db, skip, limit))
+
+
+def bench(label, fn, db, args):
+    pages = max(1, args.rows // args.page_size)
+    fn(db, 0, args.page_size)  # warm up statement and schema caches
+    start = time.perf_counter()
+    for i in range(args.iterations):
+        fn(db, (i % pages) * args.page_size, args.page_size)
+        db.expunge_all()  # don't let the ORM path serve later pages from the identity map
+    elapsed = time.perf_counter() - start
+    rows_per_sec = args.iterations * args.page_size / elapsed
+    print(f"  {label:<6} {rows_per_sec:12,.0f} rows/s  ({elapsed / args.iterations * 1e3:.3f} ms/page)")
+    return rows_per_sec
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        db = Session(bind=connection)
+        try:
+            db.add_all(
+                Calculation(a=float(i), b=2.0, type="Multiply", result=i * 2.0)
+                for i in range(args.rows)
+            )
+            db.flush()
+            db.expunge_all()
+
+            print(f"GET /calculations?limit={args.page_size} over {args.rows} rows")
+            orm = bench("ORM", orm_page, db, args)
+            core = bench("Core", core_page, db, args)
+            print(f"  speedup: {core / orm:.2f}x")
+        finally:
+            db.close()
+            transaction.rollback()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response serialization, old handler path vs PydanticJSONResponse.
+
+The old path is what FastAPI does when a handler returns a model and the
+route has a ``response_model``: dump the model, validate the dict again
+against the route's response field, serialize it with ``mode="json"`` and
+``json.dumps`` the result. The new path writes the already-validated model
+to bytes with pydantic-core.
+
+Usage:
+    python -m benchmarks.bench_serialization [--iterations N]
+"""
+
+import argparse
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.responses import PydanticJSONResponse
+from app.schemas.calculation import CalculationRead
+from app.schemas.user import Token, UserResponse
+from main import app
+
+
+def route_field(path: str, method: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path and method in route.methods:
+            return route.response_field
+    raise LookupError(f"{method} {path}")
+
+
+def sample_calculation(i: int = 1):
+    return SimpleNamespace(id=i, a=1.5 * i, b=2.0, type="Add", result=1.5 * i + 2.0)
+
+
+def sample_user():
+    now = datetime.utcnow()
+    return SimpleNamespace(
+        id=uuid4(), username="johndoe", email="john.doe@example.com", first_name="John",
+        last_name="Doe", is_active=True, is_verified=False, created_at=now, updated_at=now,
+    )
+
+
+def bench(label: str, fn, iterations: int) -> float:
+    fn()  # warm up schema/serializer caches
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    per_call_us = elapsed / iterations * 1e6
+    print(f"  {label:<28} {per_call_us:9.2f} us/response")
+    return per_call_us
+
+
+def run_sync(coro):
+    """Drive a coroutine that never suspends, without event-loop overhead."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def old_path(field, build):
+    def run():
+        content = run_sync(serialize_response(field=field, response_content=build()))
+        return JSONResponse(content).body
+
+    return run
+
+
+def new_path(build):
+    def run():
+        return PydanticJSONResponse(build()).body
+
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    orm_calc = sample_calculation()
+    orm_user = sample_user()
+    orm_page = [sample_calculation(i) for i in range(100)]
+
+    def token_fields():
+        return dict(
+            access_token="eyJhbGciOiJIUzI1NiJ9.e30.sig", refresh_token="r" * 43,
+            token_type="bearer", user=UserResponse.model_validate(orm_user),
+        )
+
+    # (response field, what the old handler returned, what the new handler returns)
+    cases = {
+        "GET /calculations/{id}": (
+            route_field("/calculations/{id}", "GET"),
+            lambda: CalculationRead.model_validate(orm_calc),
+            lambda: CalculationRead.model_validate(orm_calc),
+        ),
+        "GET /calculations (100 rows)": (
+            route_field("/calculations", "GET"),
+            lambda: [CalculationRead.model_validate(c) for c in orm_page],
+            lambda: [CalculationRead.model_validate(c) for c in orm_page],
+        ),
+        "POST /users/login": (
+            route_field("/users/login", "POST"),
+            lambda: Token(**token_fields()).model_dump(),
+            lambda: Token.model_construct(**token_fields()),
+        ),
+    }
+    for name, (field, build_old, build_new) in cases.items():
+        print(name)
+        old = bench("response_model (old)", old_path(field, build_old), args.iterations)
+        new = bench("PydanticJSONResponse (new)", new_path(build_new), args.iterations)
+        print(f"  speedup: {old / new:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
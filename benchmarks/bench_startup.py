@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import cost of the application, per module.
+
+Imports the target module in fresh interpreters under ``python -X importtime``
+and reports the median cumulative time of the target, its most expensive
+direct imports, the modules with the most self time, and whether the heavy
+auth/template dependencies were loaded. Exits with status 1 if the target
+takes longer than ``--max-ms`` or if any ``--forbid`` module was imported,
+so it can gate CI against startup regressions.
+
+Usage:
+    python -m benchmarks.bench_startup [--module main] [--runs N] [--top N]
+                                       [--max-ms MS] [--forbid MODULE ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+HEAVY_MODULES = ("passlib", "jose", "cryptography", "jinja2", "email_validator")
+
+
+def import_profile(module):
+    """Return ({name: (self_us, cumulative_us, depth)}, wall seconds) for one cold import."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile.setdefault(name.strip(), (int(self_us), int(cumulative_us), depth))
+    return profile, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median import exceeds this")
+    parser.add_argument("--forbid", nargs="*", default=[], help="fail if any of these modules is imported")
+    args = parser.parse_args()
+
+    self_times, cumulative_times, depths, walls = defaultdict(list), defaultdict(list), {}, []
+    for _ in range(args.runs):
+        profile, wall = import_profile(args.module)
+        walls.append(wall)
+        for name, (self_us, cumulative_us, depth) in profile.items():
+            self_times[name].append(self_us)
+            cumulative_times[name].append(cumulative_us)
+            depths.setdefault(name, depth)
+
+    median = {name: statistics.median(values) / 1000 for name, values in cumulative_times.items()}
+    median_self = {name: statistics.median(values) / 1000 for name, values in self_times.items()}
+    target_ms = median[args.module]
+
+    print(f"import {args.module}: {target_ms:.1f} ms median over {args.runs} runs "
+          f"(interpreter start + import {statistics.median(walls) * 1000:.1f} ms)")
+
+    print(f"\nslowest direct imports of {args.module} (cumulative):")
+    direct = [name for name, depth in depths.items() if depth == 1 and name != args.module]
+    for name in sorted(direct, key=median.get, reverse=True)[:args.top]:
+        print(f"  {median[name]:8.1f} ms  {name}")
+
+    print("\nmost self time:")
+    for name in sorted(median_self, key=median_self.get, reverse=True)[:args.top]:
+        print(f"  {median_self[name]:8.1f} ms  {name}")
+
+    print("\nheavy dependencies:")
+    for name in HEAVY_MODULES:
+        state = f"loaded ({median[name]:.1f} ms)" if name in median else "deferred"
+        print(f"  {name:<16} {state}")
+
+    failures = []
+    if args.max_ms is not None and target_ms > args.max_ms:
+        failures.append(f"import {args.module} took {target_ms:.1f} ms > {args.max_ms:.1f} ms")
+    failures.extend(f"{name} was imported" for name in args.forbid if name in median)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time to first fast response after a worker starts, with and without warmup.
+
+Seeds one user, then for each mode starts the app in a fresh interpreter
+(lifespan included, so ``WARMUP_STEPS`` runs before the first request) and
+sends ``--rounds`` rounds of login, ``GET /users/me`` and ``GET
+/calculations``. Reported per mode: startup time, each endpoint's first
+request against its steady-state median, and time to first fast response:
+the serving time each endpoint needed until it first answered within
+``--factor`` of its median, summed over the endpoints.
+
+Requires the database from ``DATABASE_URL``.
+
+Usage:
+    python -m benchmarks.bench_warmup [--rounds N] [--factor X] [--steps STEPS]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+ENDPOINTS = ("login", "me", "calculations")
+PASSWORD = "WarmUp123"
+RESULT_PREFIX = "RESULT "
+
+
+def serve_rounds(steps, username, rounds):
+    """Child process: start the app with ``steps`` and time each request (ms)."""
+    started = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    import main
+    from app.config import settings
+
+    app = main.create_app(settings.model_copy(update={"WARMUP_STEPS": steps}))
+    timings = {name: [] for name in ENDPOINTS}
+    with TestClient(app) as client:
+        startup = (time.perf_counter() - started) * 1000
+        for _ in range(rounds):
+            before = time.perf_counter()
+            response = client.post("/users/login", json={"username": username, "password": PASSWORD})
+            timings["login"].append((time.perf_counter() - before) * 1000)
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            for name, path in (("me", "/users/me"), ("calculations", "/calculations?limit=20")):
+                before = time.perf_counter()
+                client.get(path, headers=headers).raise_for_status()
+                timings[name].append((time.perf_counter() - before) * 1000)
+    return {"startup": startup, "requests": timings}
+
+
+def report(label, result, factor):
+    to_fast = 0.0
+    cells = []
+    for name in ENDPOINTS:
+        latencies = result["requests"][name]
+        median = statistics.median(latencies[1:])
+        # Time this endpoint spent serving until its first response within ``factor`` of steady state
+        for latency in latencies:
+            to_fast += latency
+            if latency <= median * factor:
+                break
+        cells.append(f"{latencies[0]:7.1f}/{median:6.1f}")
+    print(f"  {label:<7} {result['startup']:10.0f} {' '.join(f'{c:>15}' for c in cells)} {to_fast:11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--factor", type=float, default=1.5)
+    parser.add_argument("--steps", default=None, help="warmup steps to compare (default: WARMUP_STEPS)")
+    parser.add_argument("--child", nargs=2, metavar=("STEPS", "USERNAME"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(RESULT_PREFIX + json.dumps(serve_rounds(*args.child, args.rounds)))
+        return
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from app.config import settings
+    from app.database import Base
+    from app.models.calculation import Calculation
+    from app.models.user import User
+
+    engine = create_engine(settings.DATABASE_URL)
+    Base.metadata.create_all(bind=engine)
+    username = f"warmup_bench_{uuid.uuid4().hex[:8]}"
+    with Session(engine) as db:
+        user = User(first_name="Warm", last_name="Up", email=f"{username}@example.com", username=username,
+                    password_hash=User.hash_password(PASSWORD))
+        db.add(user)
+        db.flush()
+        db.add_all(Calculation(a=float(i), b=2.0, type="Add", result=i + 2.0, user_id=user.id) for i in range(20))
+        db.commit()
+        user_id = user.id
+
+    steps = args.steps if args.steps is not None else settings.WARMUP_STEPS
+    print(f"{args.rounds} rounds of login, /users/me, /calculations; fast = within {args.factor}x of median")
+    print(f"  {'warmup':<7} {'startup ms':>10} {'login 1st/med':>15} {'me 1st/med':>15} "
+          f"{'calcs 1st/med':>15} {'to fast ms':>11}")
+    try:
+        for label, mode_steps in (("off", ""), ("on", steps)):
+            child = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_warmup", "--rounds", str(args.rounds),
+                 "--child", mode_steps, username],
+                capture_output=True, text=True, check=True,
+                # Quiet children: per-statement echo would dominate the fast requests
+                env={**os.environ, "DB_ECHO": "false", "LOG_LEVEL": "WARNING"},
+            )
+            line = next(line for line in child.stdout.splitlines() if line.startswith(RESULT_PREFIX))
+            report(label, json.loads(line[len(RESULT_PREFIX):]), args.factor)
+    finally:
+        with Session(engine) as db:
+            db.query(User).filter(User.id == user_id).delete()
+            db.commit()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
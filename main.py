@@ -1,32 +1,120 @@
 # main.py
 
-from fastapi import FastAPI, HTTPException, Request, Depends, status
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Depends, Query, status
 from fastapi.responses import JSONResponse
-from fastapi.templating import Jinja2Templates
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, Field, field_validator  # Use @validator for Pydantic 1.x
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.orm import Session
 from app.operations import add, subtract, multiply, divide  # Ensure correct import path
-from app.database import get_db
+from app.config import Settings, settings as default_settings
+from app.database import get_db, init_engine, dispose_engine
 from app.models.user import User
 from app.models.calculation import Calculation
+from app.models.refresh_token import RefreshToken
+from app.models.api_key import ApiKey
 from app.schemas.base import UserCreate, UserRead
-from app.schemas.user import UserResponse, Token, UserLogin
-from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate
-from app.auth.dependencies import get_current_user, get_current_active_user
-from typing import List
-import uvicorn
+from app.schemas.user import UserResponse, Token, UserLogin, RefreshTokenRequest
+from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate, parse_fields
+from app.schemas.api_key import ApiKeyCreate, ApiKeyCreated, ApiKeyRead
+from app.auth.dependencies import get_current_user, get_current_active_user, api_key_or_user, oauth2_scheme
+from app.auth.api_keys import api_key_cache
+from app.responses import PydanticJSONResponse
+from app.negotiation import negotiated_response, wants_msgpack
+from app.routing import InstrumentedRoute
+from app.metrics import configure_metrics, instrument_engine, mark_process_dead, metrics_response, uninstrument_engine
+from app.conditional import if_none_match, make_etag, not_modified, validator_headers
+from app.compression import CompressionMiddleware
+from app.pages import PageCache
+from app.health import loop_lag_monitor, readiness_probe
+from app.blocking import blocking_call_detector
+from app.profiling import ProfilingMiddleware
+from app.tracing import tracer
+from app.logging_setup import route_of, setup_logging
+from app.lifecycle import DrainMiddleware, RequestTracker, drain_on_signal
+from app.warmup import warm_up
+from app.auth.last_login import last_login_buffer
+from app.auth.refresh_tokens import refresh_token_buffer
+from app.auth.revocation import token_revocation_list
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Routes are collected on a router and mounted by create_app(); route_class
+# lets them accept MessagePack request bodies (JSON stays the default) and
+# records per-route request metrics
+router = APIRouter(route_class=InstrumentedRoute)
 
-# Setup templates directory
-templates = Jinja2Templates(directory="templates")
+def configure_singletons(settings: Settings) -> None:
+    """
+    Apply an app's settings to the per-process objects its routes share.
+
+    They are built at import from the global settings; the lifespan
+    reconfigures them before any of them starts.
+    """
+    configure_metrics(settings)
+    tracer.configure(settings)
+    last_login_buffer.configure(settings)
+    refresh_token_buffer.configure(settings)
+    api_key_cache.configure(settings)
+    token_revocation_list.configure(settings)
+    loop_lag_monitor.configure(settings)
+    readiness_probe.configure(settings)
+    blocking_call_detector.configure(settings)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the background log writer, configure the shared per-process
+    objects (tracer, write-behind queues, caches, monitors) from the app's
+    settings, create the engine and warm the worker up (pool connections,
+    hot statements, schemas, bcrypt, JWT; see WARMUP_STEPS), render the
+    template pages, then start the background writers and the event-loop
+    lag sampler. Nothing is served, and readiness is not reported, until
+    this finishes.
+
+    Shutdown starts with the stop signal, before the server itself stops:
+    new requests get 503 and readiness fails while in-flight ones get up to
+    SHUTDOWN_DRAIN_SECONDS (see drain_on_signal). Once the server has
+    stopped, the lifespan stops the monitors, flushes the write-behind
+    queues (last_login timestamps, login refresh tokens) and traces, and
+    only then disposes the pool, so nothing still running loses its
+    connection.
+    """
+    settings = app.state.settings
+    setup_logging(settings.LOG_LEVEL, settings.LOG_JSON, settings.LOG_QUEUE_SIZE)
+    configure_singletons(settings)
+    engine = init_engine(settings.DATABASE_URL, echo=settings.DB_ECHO)
+    instrument_engine(engine)
+    warm_up(engine, settings.WARMUP_STEPS, settings.DB_WARMUP_CONNECTIONS)
+    app.state.page_cache.load()
+    last_login_buffer.start()
+    refresh_token_buffer.start()
+    token_revocation_list.start()
+    loop_lag_monitor.start()
+    if settings.BLOCKING_CALL_DETECTION:
+        blocking_call_detector.start()
+    restore_signal_handlers = drain_on_signal(app.state.request_tracker, settings.SHUTDOWN_DRAIN_SECONDS)
+    try:
+        yield
+    finally:
+        restore_signal_handlers()
+        blocking_call_detector.stop()
+        await loop_lag_monitor.stop()
+        token_revocation_list.stop()
+        last_login_buffer.stop()
+        refresh_token_buffer.stop()
+        tracer.shutdown()
+        uninstrument_engine(engine)
+        dispose_engine()
+        mark_process_dead()
+        # Draining covers the shutdown window only; a stopped app object can
+        # still be served (lazily, without a lifespan) or started again
+        app.state.request_tracker.start_accepting()
 
 # Pydantic model for request data
 class OperationRequest(BaseModel):
@@ -48,98 +136,96 @@ class ErrorResponse(BaseModel):
     error: str = Field(..., description="Error message")
 
 # Custom Exception Handlers
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    logger.error(f"HTTPException on {request.url.path}: {exc.detail}")
+    logger.error("HTTPException on %s: %s", request.url.path, exc.detail, extra={"route": route_of(request)})
     return JSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail},
     )
 
-@app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     # Extracting error messages
     error_messages = "; ".join([f"{err['loc'][-1]}: {err['msg']}" for err in exc.errors()])
-    logger.error(f"ValidationError on {request.url.path}: {error_messages}")
+    logger.error("ValidationError on %s: %s", request.url.path, error_messages, extra={"route": route_of(request)})
     return JSONResponse(
         status_code=400,
         content={"error": error_messages},
     )
 
-@app.get("/")
+@router.get("/")
 async def read_root(request: Request):
     """
     Serve the index.html template.
     """
-    return templates.TemplateResponse("index.html", {"request": request})
+    return request.app.state.page_cache.response(request, "index.html")
 
-@app.get("/register")
+@router.get("/register")
 async def register_page(request: Request):
     """
     Serve the registration page.
     """
-    return templates.TemplateResponse("register.html", {"request": request})
+    return request.app.state.page_cache.response(request, "register.html")
 
-@app.get("/login")
+@router.get("/login")
 async def login_page(request: Request):
     """
     Serve the login page.
     """
-    return templates.TemplateResponse("login.html", {"request": request})
+    return request.app.state.page_cache.response(request, "login.html")
 
-@app.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def add_route(operation: OperationRequest):
+@router.post("/add", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
+async def add_route(operation: OperationRequest, request: Request):
     """
     Add two numbers.
     """
     try:
         result = add(operation.a, operation.b)
-        return OperationResponse(result=result)
+        return negotiated_response(request, OperationResponse(result=result))
     except Exception as e:
-        logger.error(f"Add Operation Error: {str(e)}")
+        logger.error("Add Operation Error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def subtract_route(operation: OperationRequest):
+@router.post("/subtract", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
+async def subtract_route(operation: OperationRequest, request: Request):
     """
     Subtract two numbers.
     """
     try:
         result = subtract(operation.a, operation.b)
-        return OperationResponse(result=result)
+        return negotiated_response(request, OperationResponse(result=result))
     except Exception as e:
-        logger.error(f"Subtract Operation Error: {str(e)}")
+        logger.error("Subtract Operation Error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def multiply_route(operation: OperationRequest):
+@router.post("/multiply", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
+async def multiply_route(operation: OperationRequest, request: Request):
     """
     Multiply two numbers.
     """
     try:
         result = multiply(operation.a, operation.b)
-        return OperationResponse(result=result)
+        return negotiated_response(request, OperationResponse(result=result))
     except Exception as e:
-        logger.error(f"Multiply Operation Error: {str(e)}")
+        logger.error("Multiply Operation Error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
-async def divide_route(operation: OperationRequest):
+@router.post("/divide", response_model=OperationResponse, responses={400: {"model": ErrorResponse}})
+async def divide_route(operation: OperationRequest, request: Request):
     """
     Divide two numbers.
     """
     try:
         result = divide(operation.a, operation.b)
-        return OperationResponse(result=result)
+        return negotiated_response(request, OperationResponse(result=result))
     except ValueError as e:
-        logger.error(f"Divide Operation Error: {str(e)}")
+        logger.error("Divide Operation Error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Divide Operation Internal Error: {str(e)}")
+        logger.error("Divide Operation Internal Error: %s", e)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 # User Authentication and Registration Routes
-@app.post("/users/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@router.post("/users/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
     db: Session = Depends(get_db)
@@ -151,16 +237,16 @@ async def register_user(
         user = User.register(db, user_data.model_dump())
         db.commit()
         db.refresh(user)
-        return UserRead.model_validate(user)
+        return PydanticJSONResponse(UserRead.model_validate(user), status_code=status.HTTP_201_CREATED)
     except ValueError as e:
-        logger.error(f"User registration error: {str(e)}")
+        logger.error("User registration error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected registration error: {str(e)}")
+        logger.error("Unexpected registration error: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.post("/users/login", response_model=Token)
+@router.post("/users/login", response_model=Token)
 async def login_user(
     user_credentials: UserLogin,
     db: Session = Depends(get_db)
@@ -169,22 +255,86 @@ async def login_user(
     Authenticate user and return access token verifying hashed passwords.
     """
     try:
-        token_data = User.authenticate(db, user_credentials.username, user_credentials.password)
+        token_data = User.login(db, user_credentials.username, user_credentials.password)
         if not token_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return token_data
+        with tracer.span("serialize"):
+            return PydanticJSONResponse(token_data)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Login error: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/users/token/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_request: RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token and a rotated refresh token.
+    """
+    try:
+        token_data = User.refresh(db, refresh_request.refresh_token)
+        if not token_data:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        with tracer.span("serialize"):
+            return PydanticJSONResponse(token_data)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Token refresh error: %s", e)
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/users/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_refresh_token(
+    refresh_request: RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke a refresh token and every token rotated from the same login.
+    """
+    try:
+        RefreshToken.revoke(db, refresh_request.refresh_token)
+        db.commit()
+        return None  # 204 No Content
+    except Exception as e:
+        logger.error("Token revoke error: %s", e)
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/users/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_user(
+    refresh_request: Optional[RefreshTokenRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the presented access token and, if given, its refresh token family.
+    """
+    try:
+        User.revoke_access_token(db, token)
+        if refresh_request:
+            RefreshToken.revoke(db, refresh_request.refresh_token)
+        db.commit()
+        return None  # 204 No Content
+    except Exception as e:
+        logger.error("Logout error: %s", e)
+        db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
 # Legacy endpoints for backward compatibility
-@app.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def register_user_legacy(
     user_data: UserCreate,
     db: Session = Depends(get_db)
@@ -194,7 +344,7 @@ async def register_user_legacy(
     """
     return await register_user(user_data, db)
 
-@app.post("/login", response_model=Token)
+@router.post("/login", response_model=Token)
 async def login_user_legacy(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
@@ -203,21 +353,22 @@ async def login_user_legacy(
     Authenticate user and return access token (legacy endpoint).
     """
     try:
-        token_data = User.authenticate(db, form_data.username, form_data.password)
+        token_data = User.login(db, form_data.username, form_data.password)
         if not token_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return token_data
+        with tracer.span("serialize"):
+            return PydanticJSONResponse(token_data)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.post("/login/json", response_model=Token)
+@router.post("/login/json", response_model=Token)
 async def login_user_json(
     user_credentials: UserLogin,
     db: Session = Depends(get_db)
@@ -226,69 +377,160 @@ async def login_user_json(
     Authenticate user with JSON payload and return access token.
     """
     try:
-        token_data = User.authenticate(db, user_credentials.username, user_credentials.password)
+        token_data = User.login(db, user_credentials.username, user_credentials.password)
         if not token_data:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return token_data
+        with tracer.span("serialize"):
+            return PydanticJSONResponse(token_data)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"JSON Login error: {str(e)}")
+        logger.error("JSON Login error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/users/me", response_model=UserResponse)
+@router.get("/users/me", response_model=UserResponse)
 async def read_users_me(
     current_user: UserResponse = Depends(get_current_active_user)
 ):
     """
     Get current user information.
     """
-    return current_user
+    return PydanticJSONResponse(current_user)
+
+# API key management for machine clients
+@router.post("/users/api-keys", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+async def create_api_key(
+    key_data: ApiKeyCreate,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create an API key. The raw key is only returned in this response.
+    """
+    try:
+        raw_key, api_key = ApiKey.create(db, current_user.id, key_data.name, key_data.scopes)
+        db.commit()
+        db.refresh(api_key)
+        return PydanticJSONResponse(
+            ApiKeyCreated(key=raw_key, **ApiKeyRead.model_validate(api_key).model_dump()),
+            status_code=status.HTTP_201_CREATED
+        )
+    except Exception as e:
+        logger.error("Create API key error: %s", e)
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/users/api-keys", response_model=List[ApiKeyRead])
+async def list_api_keys(
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the current user's API keys.
+    """
+    api_keys = db.query(ApiKey).filter(ApiKey.user_id == current_user.id).order_by(ApiKey.created_at).all()
+    return PydanticJSONResponse([ApiKeyRead.model_validate(api_key) for api_key in api_keys])
+
+@router.delete("/users/api-keys/{key_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_api_key(
+    key_id: UUID,
+    current_user: UserResponse = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke one of the current user's API keys.
+    """
+    try:
+        api_key = db.query(ApiKey).filter(ApiKey.id == key_id, ApiKey.user_id == current_user.id).first()
+        if not api_key:
+            raise HTTPException(status_code=404, detail="API key not found")
+
+        api_key.revoke()
+        db.commit()
+        api_key_cache.invalidate_key(api_key.id)
+
+        return None  # 204 No Content
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Revoke API key error: %s", e)
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Internal server error")
 
 # Calculation BREAD endpoints
-@app.get("/calculations", response_model=List[CalculationRead])
+@router.get("/calculations", response_model=List[CalculationRead])
 async def browse_calculations(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,result"),
+    db: Session = Depends(get_db),
+    user_id: Optional[UUID] = Depends(api_key_or_user("calculations:read"))
 ):
     """
     Browse all calculations with pagination.
+
+    Sends an ETag and Last-Modified for the page and answers a matching
+    If-None-Match with 304 without serializing the rows. ``fields`` limits
+    both the response and the SELECT to the named columns.
     """
     try:
-        calculations = db.query(Calculation).offset(skip).limit(limit).all()
-        return [CalculationRead.model_validate(calc) for calc in calculations]
+        selected = parse_fields(fields)
+        page, versions, last_modified = Calculation.fetch_page_versioned(db, skip, limit, selected)
+        etag = make_etag("page", skip, limit, selected, wants_msgpack(request), versions)
+        headers = validator_headers(etag, last_modified)
+        if if_none_match(request, etag):
+            return not_modified(headers)
+        return negotiated_response(request, page, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Browse calculations error: {str(e)}")
+        logger.error("Browse calculations error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/calculations/{id}", response_model=CalculationRead)
+@router.get("/calculations/{id}", response_model=CalculationRead)
 async def read_calculation(
     id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,result"),
+    db: Session = Depends(get_db),
+    user_id: Optional[UUID] = Depends(api_key_or_user("calculations:read"))
 ):
     """
     Read a specific calculation by ID.
+
+    Answers a matching If-None-Match with 304 without serializing the row.
+    ``fields`` limits both the response and the SELECT to the named columns.
     """
     try:
-        calculation = db.query(Calculation).filter(Calculation.id == id).first()
-        if not calculation:
+        selected = parse_fields(fields)
+        found = Calculation.fetch_one_versioned(db, id, selected)
+        if not found:
             raise HTTPException(status_code=404, detail="Calculation not found")
-        return CalculationRead.model_validate(calculation)
+        calculation, version, updated_at = found
+        etag = make_etag("calculation", id, version, selected, wants_msgpack(request))
+        headers = validator_headers(etag, updated_at)
+        if if_none_match(request, etag):
+            return not_modified(headers)
+        return negotiated_response(request, calculation, headers=headers)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Read calculation error: {str(e)}")
+        logger.error("Read calculation error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.post("/calculations", response_model=CalculationRead, status_code=status.HTTP_201_CREATED)
+@router.post("/calculations", response_model=CalculationRead, status_code=status.HTTP_201_CREATED)
 async def add_calculation(
     calculation_data: CalculationCreate,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_db),
+    user_id: Optional[UUID] = Depends(api_key_or_user("calculations:write"))
 ):
     """
     Add a new calculation using CalculationCreate schema.
@@ -298,7 +540,8 @@ async def add_calculation(
         calculation = Calculation(
             a=calculation_data.a,
             b=calculation_data.b,
-            type=calculation_data.type
+            type=calculation_data.type,
+            user_id=user_id
         )
         
         # Compute the result
@@ -309,20 +552,26 @@ async def add_calculation(
         db.commit()
         db.refresh(calculation)
         
-        return CalculationRead.model_validate(calculation)
+        return negotiated_response(
+            request,
+            CalculationRead.model_validate(calculation),
+            status_code=status.HTTP_201_CREATED
+        )
     except ValueError as e:
-        logger.error(f"Add calculation error: {str(e)}")
+        logger.error("Add calculation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected add calculation error: {str(e)}")
+        logger.error("Unexpected add calculation error: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.put("/calculations/{id}", response_model=CalculationRead)
+@router.put("/calculations/{id}", response_model=CalculationRead)
 async def edit_calculation(
     id: int,
     calculation_update: CalculationUpdate,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_db),
+    user_id: Optional[UUID] = Depends(api_key_or_user("calculations:write"))
 ):
     """
     Edit/update an existing calculation.
@@ -344,21 +593,22 @@ async def edit_calculation(
         db.commit()
         db.refresh(calculation)
         
-        return CalculationRead.model_validate(calculation)
+        return negotiated_response(request, CalculationRead.model_validate(calculation))
     except HTTPException:
         raise
     except ValueError as e:
-        logger.error(f"Edit calculation error: {str(e)}")
+        logger.error("Edit calculation error: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected edit calculation error: {str(e)}")
+        logger.error("Unexpected edit calculation error: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.delete("/calculations/{id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/calculations/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_calculation(
     id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    user_id: Optional[UUID] = Depends(api_key_or_user("calculations:write"))
 ):
     """
     Delete a calculation by ID.
@@ -375,16 +625,89 @@ async def delete_calculation(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Delete calculation error: {str(e)}")
+        logger.error("Delete calculation error: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/health")
+@router.get("/health")
+@router.get("/health/live")
 async def health_check():
     """
-    Health check endpoint for monitoring and Docker health checks.
+    Liveness: the worker is up and serving requests.
+
+    Checks nothing else, so a slow database never gets a worker restarted.
+    """
+    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+
+@router.get("/health/ready")
+def readiness_check(request: Request):
     """
-    return {"status": "healthy", "timestamp": "2025-11-30"}
+    Readiness: database reachable, pool not exhausted, event loop responsive.
+
+    Returns 503 when the worker should be taken out of rotation, including
+    while it drains for shutdown. The DB ping is cached briefly so frequent
+    probes don't add database load. Runs in the threadpool because the ping
+    is a blocking call.
+    """
+    report = readiness_probe.check(init_engine(), draining=request.app.state.request_tracker.draining)
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics, aggregated across workers when METRICS_MULTIPROC_DIR is set."""
+    return metrics_response()
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    Nothing here touches the database: the engine and pool are created by
+    the lifespan when a server starts the app (or lazily on first use, e.g.
+    in tests that never enter the lifespan).
+
+    ``settings`` drives the middleware and page cache here, route metrics
+    and tracing when the router is mounted, and the shared per-process
+    objects once the lifespan runs (see ``configure_singletons``). A few
+    values stay process-wide and come from the global settings:
+    METRICS_MULTIPROC_DIR, LOG_SAMPLE_*, REFRESH_TOKEN_EXPIRE_DAYS, and
+    DATABASE_URL / DB_ECHO if the engine already exists.
+    """
+    settings = settings or default_settings
+    app = FastAPI(lifespan=lifespan)
+    app.state.settings = settings
+    app.state.page_cache = PageCache(
+        auto_reload=settings.TEMPLATE_AUTO_RELOAD,
+        cache_control=settings.PAGE_CACHE_CONTROL,
+    )
+    if settings.PROFILING_SECRET or settings.PROFILE_ALL_REQUESTS:
+        app.add_middleware(
+            ProfilingMiddleware,
+            secret=settings.PROFILING_SECRET,
+            profile_all=settings.PROFILE_ALL_REQUESTS,
+            interval=settings.PROFILING_INTERVAL_SECONDS,
+            output_dir=settings.PROFILING_OUTPUT_DIR,
+        )
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+    # Outermost, so requests refused while draining skip all other work
+    app.state.request_tracker = RequestTracker()
+    app.add_middleware(
+        DrainMiddleware,
+        tracker=app.state.request_tracker,
+        exempt_paths=("/health", "/health/live", "/health/ready", "/metrics"),
+    )
+    app.add_exception_handler(HTTPException, http_exception_handler)
+    app.add_exception_handler(RequestValidationError, validation_exception_handler)
+    app.include_router(router)
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    import uvicorn
+    uvicorn.run(app, host="127.0.0.1", port=8000,
+                timeout_graceful_shutdown=int(default_settings.SHUTDOWN_DRAIN_SECONDS))
@@ -37,6 +37,7 @@ try:
     from sqlalchemy.exc import SQLAlchemyError, IntegrityError
     from app.database import Base, get_engine, get_sessionmaker
     from app.models.user import User
+    from app.models.calculation import Calculation  # noqa: F401 - registers the mapper
     from app.config import settings
     from app.database_init import init_db, drop_db
     HAS_SQLALCHEMY = True
@@ -177,6 +178,16 @@ def setup_test_database(request):
         drop_db()
         logger.info("Dropped test database tables.")
 
+@pytest.fixture
+def ensure_tables() -> None:
+    """
+    Make sure the tables exist even if an earlier module dropped them.
+    Modules that need this opt in with ``pytestmark = pytest.mark.usefixtures("ensure_tables")``.
+    """
+    if not HAS_SQLALCHEMY:
+        pytest.skip("SQLAlchemy not available")
+    Base.metadata.create_all(bind=test_engine)
+
 @pytest.fixture
 def db_session(request) -> Generator[Any, None, None]:
     """
@@ -225,6 +236,14 @@ def test_user(db_session: Any) -> Any:
     logger.info(f"Created test user with ID: {user.id}")
     return user
 
+@pytest.fixture
+def auth_headers(db_session: Any) -> Dict[str, str]:
+    """Register a user and return bearer headers for it."""
+    user = User.register(db_session, {**create_fake_user(), "password": "TestPass123"})
+    db_session.commit()
+    token = User.create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
+
 @pytest.fixture
 def seed_users(db_session: Any, request) -> List[Any]:
     """
@@ -0,0 +1,155 @@
+# tests/integration/test_api_keys.py
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.auth.api_keys import api_key_cache, VerifiedKeyCache
+from app.database import get_db
+from app.models.api_key import ApiKey, hash_api_key, parse_key_prefix
+from app.models.calculation import Calculation
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables):
+    """Test client bound to the PostgreSQL test database."""
+    api_key_cache.clear()
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+@pytest.fixture
+def auth_headers(client, db_session):
+    """Register a user and return bearer headers for it."""
+    User.register(db_session, {
+        "first_name": "Machine",
+        "last_name": "Owner",
+        "email": "machine@example.com",
+        "username": "machineowner",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+    response = client.post("/users/login", json={"username": "machineowner", "password": "TestPass123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def create_key(client, auth_headers, **body):
+    body.setdefault("name", "batch")
+    response = client.post("/users/api-keys", json=body, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+def test_create_api_key_stores_only_digest(client, auth_headers, db_session):
+    """The raw key is returned once; the table holds the prefix and digest."""
+    created = create_key(client, auth_headers)
+
+    assert created["key"].startswith("ak_")
+    assert parse_key_prefix(created["key"]) == created["prefix"]
+    stored = db_session.query(ApiKey).one()
+    assert stored.key_hash == hash_api_key(created["key"])
+    assert created["key"] not in (stored.key_hash, stored.prefix)
+
+    listed = client.get("/users/api-keys", headers=auth_headers).json()
+    assert [k["id"] for k in listed] == [created["id"]]
+    assert "key" not in listed[0]
+
+def test_api_key_authenticates_calculation_requests(client, auth_headers, db_session):
+    """A write-scoped key creates calculations owned by the key's user."""
+    created = create_key(client, auth_headers)
+
+    response = client.post(
+        "/calculations",
+        json={"a": 2, "b": 3, "type": "Add"},
+        headers={"X-API-Key": created["key"]},
+    )
+    assert response.status_code == 201
+
+    owner = db_session.query(User).filter(User.username == "machineowner").one()
+    calculation = db_session.query(Calculation).one()
+    assert calculation.user_id == owner.id
+
+def test_verified_key_is_served_from_cache(client, auth_headers, monkeypatch):
+    """After the first request the key is not looked up in the database again."""
+    created = create_key(client, auth_headers, scopes=["calculations:read"])
+    headers = {"X-API-Key": created["key"]}
+    assert client.get("/calculations", headers=headers).status_code == 200
+
+    def fail(*args, **kwargs):
+        raise AssertionError("database lookup for a cached key")
+    monkeypatch.setattr(ApiKey, "verify", fail)
+
+    assert client.get("/calculations", headers=headers).status_code == 200
+
+def test_invalid_api_key_rejected(client):
+    """A present but unknown key is a 401."""
+    response = client.get("/calculations", headers={"X-API-Key": "ak_deadbeef_nope"})
+    assert response.status_code == 401
+
+def test_api_key_scope_enforced(client, auth_headers):
+    """A read-only key cannot create calculations."""
+    created = create_key(client, auth_headers, scopes=["calculations:read"])
+
+    response = client.post(
+        "/calculations",
+        json={"a": 2, "b": 3, "type": "Add"},
+        headers={"X-API-Key": created["key"]},
+    )
+    assert response.status_code == 403
+
+def test_key_without_scope_rejected_alongside_bearer(client, auth_headers):
+    """A key is checked on its own scopes even when a valid bearer token is also sent."""
+    created = create_key(client, auth_headers, scopes=["calculations:read"])
+
+    response = client.post(
+        "/calculations",
+        json={"a": 2, "b": 3, "type": "Add"},
+        headers={**auth_headers, "X-API-Key": created["key"]},
+    )
+    assert response.status_code == 403
+
+def test_calculations_accept_anonymous_or_bearer(client, auth_headers, db_session):
+    """Credentials are optional; a bearer user owns what it creates, a bad token is rejected."""
+    assert client.get("/calculations").status_code == 200
+    assert client.get("/calculations", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    response = client.post("/calculations", json={"a": 2, "b": 3, "type": "Add"}, headers=auth_headers)
+    assert response.status_code == 201
+    owner = db_session.query(User).filter(User.username == "machineowner").one()
+    assert db_session.query(Calculation).one().user_id == owner.id
+
+def test_revoked_api_key_rejected(client, auth_headers):
+    """Revocation takes effect immediately on the revoking worker."""
+    created = create_key(client, auth_headers)
+    headers = {"X-API-Key": created["key"]}
+    assert client.get("/calculations", headers=headers).status_code == 200
+
+    response = client.delete(f"/users/api-keys/{created['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+    assert client.get("/calculations", headers=headers).status_code == 401
+
+def test_verified_key_cache_expires_and_evicts():
+    """Entries expire after the TTL and the cache stays within max_size."""
+    from uuid import uuid4
+    from app.schemas.api_key import ApiKeyPrincipal
+
+    principal = ApiKeyPrincipal(key_id=uuid4(), user_id=uuid4(), scopes=frozenset())
+    expired = VerifiedKeyCache(ttl=-1, max_size=10)
+    expired.put("digest", principal)
+    assert expired.get("digest") is None
+
+    small = VerifiedKeyCache(ttl=60, max_size=2)
+    for digest in ("a", "b", "c"):
+        small.put(digest, principal)
+    assert small.get("a") is None
+    assert small.get("c") == principal
@@ -0,0 +1,72 @@
+# tests/integration/test_app_factory.py
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import app.database as database
+import main
+from app.config import settings
+from app.auth.api_keys import api_key_cache
+from app.auth.last_login import last_login_buffer
+from app.auth.revocation import token_revocation_list
+from app.health import readiness_probe
+from main import create_app
+
+
+def test_create_app_does_not_touch_database():
+    database.dispose_engine()
+    created = create_app(settings)
+    assert created.state.settings is settings
+    assert database._engine is None
+
+
+def test_lifespan_creates_and_disposes_engine():
+    database.dispose_engine()
+    created = create_app(settings.model_copy())
+
+    with TestClient(created) as client:
+        assert database._engine is not None
+        assert database._engine.url.render_as_string(hide_password=False) == settings.DATABASE_URL
+        assert client.get("/health").status_code == 200
+
+    assert database._engine is None
+
+
+def test_session_local_created_on_first_use():
+    database.dispose_engine()
+    from app.database import SessionLocal
+
+    assert database._engine is not None
+    assert SessionLocal is database.get_session_factory()
+
+
+def test_logging_starts_with_the_lifespan(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "setup_logging", lambda *args: calls.append(args))
+    created = create_app(settings.model_copy(update={"LOG_LEVEL": "WARNING"}))
+    assert calls == []
+
+    with TestClient(created):
+        assert calls == [("WARNING", settings.LOG_JSON, settings.LOG_QUEUE_SIZE)]
+
+
+def test_create_app_settings_reach_routes_and_singletons():
+    custom = settings.model_copy(update={
+        "METRICS_ENABLED": False,
+        "LAST_LOGIN_FLUSH_SECONDS": 1.5,
+        "API_KEY_CACHE_TTL_SECONDS": 7.0,
+        "TOKEN_REVOCATION_REFRESH_SECONDS": 9.0,
+        "HEALTH_MAX_LOOP_LAG_SECONDS": 2.0,
+    })
+    labels = {"method": "GET", "route": "/health/live", "status": "200"}
+    before = REGISTRY.get_sample_value("http_requests_total", labels) or 0.0
+    try:
+        with TestClient(create_app(custom)) as client:
+            assert last_login_buffer.flush_interval == 1.5
+            assert api_key_cache.ttl == 7.0
+            assert token_revocation_list.refresh_interval == 9.0
+            assert readiness_probe.max_loop_lag == 2.0
+            assert client.get("/health/live").status_code == 200
+        assert (REGISTRY.get_sample_value("http_requests_total", labels) or 0.0) == before
+    finally:
+        main.configure_singletons(settings)
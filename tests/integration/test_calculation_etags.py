@@ -0,0 +1,107 @@
+# tests/integration/test_calculation_etags.py
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app import responses
+from app.database import get_db
+from app.models.calculation import Calculation
+from tests.conftest import TestingSessionLocal
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables, auth_headers):
+    """Test client bound to the PostgreSQL test database."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app, headers=auth_headers)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+@pytest.fixture
+def calculation_id(client, db_session):
+    response = client.post("/calculations", json={"a": 6, "b": 3, "type": "Divide"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+def test_read_returns_etag_and_304(client, calculation_id, monkeypatch):
+    """A matching If-None-Match gets an empty 304 and nothing is serialized."""
+    first = client.get(f"/calculations/{calculation_id}")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')  # the client negotiates gzip/br
+    assert "last-modified" in first.headers
+
+    def fail(*args, **kwargs):
+        raise AssertionError("body serialized for a 304")
+    monkeypatch.setattr(responses, "to_json", fail)
+
+    second = client.get(f"/calculations/{calculation_id}", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+def test_update_changes_etag(client, calculation_id):
+    etag = client.get(f"/calculations/{calculation_id}").headers["etag"]
+
+    response = client.put(f"/calculations/{calculation_id}", json={"a": 9})
+    assert response.status_code == 200
+
+    refreshed = client.get(f"/calculations/{calculation_id}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["result"] == 3.0
+
+def test_browse_page_etag_and_last_modified(client, calculation_id):
+    first = client.get("/calculations")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"].endswith("GMT")
+
+    assert client.get("/calculations", headers={"If-None-Match": etag}).status_code == 304
+    # Strong form (as sent by a client that negotiated no coding) still matches
+    assert etag.startswith("W/")
+    assert client.get("/calculations", headers={"If-None-Match": etag[2:]}).status_code == 304
+
+    client.delete(f"/calculations/{calculation_id}")
+    after_delete = client.get("/calculations", headers={"If-None-Match": etag})
+    assert after_delete.status_code == 200
+    assert after_delete.json() == []
+
+def test_compressed_page_and_304_carry_the_same_etag(client, calculation_id):
+    """A 304 repeats the weak ETag of the compressed 200 it stands for."""
+    for _ in range(10):
+        client.post("/calculations", json={"a": 1, "b": 2, "type": "Add"})
+    first = client.get("/calculations", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+
+    second = client.get(
+        "/calculations", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]}
+    )
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["etag"].startswith('W/"')
+
+def test_etag_differs_per_representation(client, calculation_id):
+    """JSON and MessagePack bodies of the same row are different representations."""
+    json_etag = client.get(f"/calculations/{calculation_id}").headers["etag"]
+    msgpack_etag = client.get(
+        f"/calculations/{calculation_id}", headers={"Accept": "application/msgpack"}
+    ).headers["etag"]
+    assert json_etag != msgpack_etag
+
+def test_version_increments_on_update(db_session):
+    calculation = Calculation(a=1, b=2, type="Add", result=3)
+    db_session.add(calculation)
+    db_session.commit()
+    assert calculation.version == 1
+
+    calculation.a = 5
+    db_session.commit()
+    assert calculation.version == 2
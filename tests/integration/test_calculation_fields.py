@@ -0,0 +1,79 @@
+# tests/integration/test_calculation_fields.py
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from main import app
+from app.database import get_db
+from app.models.calculation import Calculation
+from tests.conftest import test_engine, TestingSessionLocal
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables, auth_headers):
+    """Test client bound to the PostgreSQL test database."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app, headers=auth_headers)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+@pytest.fixture
+def calculation_id(client, db_session):
+    response = client.post("/calculations", json={"a": 4, "b": 5, "type": "Multiply"})
+    assert response.status_code == 201
+    return response.json()["id"]
+
+@pytest.fixture
+def captured_selects():
+    """SQL text of every calculations SELECT issued while the test runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "calculations" in statement:
+            statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", capture)
+
+def test_read_sparse_fields(client, calculation_id, captured_selects):
+    response = client.get(f"/calculations/{calculation_id}?fields=result,id")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": calculation_id, "result": 20.0}
+    select_list = captured_selects[-1].split("FROM")[0]
+    assert "calculations.result" in select_list
+    assert "calculations.a" not in select_list
+    assert "calculations.type" not in select_list
+
+def test_browse_sparse_fields(client, calculation_id, captured_selects):
+    response = client.get("/calculations?fields=id,result")
+
+    assert response.status_code == 200
+    assert response.json() == [{"id": calculation_id, "result": 20.0}]
+    select_list = captured_selects[-1].split("FROM")[0]
+    assert "calculations.b" not in select_list
+
+def test_sparse_fields_have_own_etag(client, calculation_id):
+    full = client.get(f"/calculations/{calculation_id}").headers["etag"]
+    sparse = client.get(f"/calculations/{calculation_id}?fields=id").headers["etag"]
+    assert full != sparse
+
+def test_unknown_field_rejected(client, calculation_id):
+    response = client.get(f"/calculations/{calculation_id}?fields=id,password")
+    assert response.status_code == 400
+    assert "password" in response.json()["error"]
+
+    assert client.get("/calculations?fields=").status_code == 400
+
+def test_fetch_page_fields(db_session, calculation_id):
+    assert Calculation.fetch_page(db_session, fields=("type",)) == [{"type": "Multiply"}]
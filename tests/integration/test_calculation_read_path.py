@@ -0,0 +1,36 @@
+# tests/integration/test_calculation_read_path.py
+
+import pytest
+from app.models.calculation import Calculation
+from app.schemas.calculation import CalculationRead
+
+pytestmark = pytest.mark.usefixtures("ensure_tables")
+
+@pytest.fixture
+def calculations(db_session):
+    rows = [Calculation(a=float(i), b=2.0, type="Add", result=i + 2.0) for i in range(5)]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+def test_fetch_page_returns_response_dicts(db_session, calculations):
+    """Core rows map to the same shape as the ORM-backed response model."""
+    page = Calculation.fetch_page(db_session, skip=0, limit=10)
+
+    assert page == [CalculationRead.model_validate(calc).model_dump() for calc in calculations]
+
+def test_fetch_page_does_not_load_orm_instances(db_session, calculations):
+    """Nothing is added to the session identity map on the Core path."""
+    db_session.expunge_all()
+    Calculation.fetch_page(db_session, skip=0, limit=10)
+    assert len(db_session.identity_map) == 0
+
+def test_fetch_page_paginates_in_id_order(db_session, calculations):
+    page = Calculation.fetch_page(db_session, skip=2, limit=2)
+    assert [row["id"] for row in page] == [calculations[2].id, calculations[3].id]
+
+def test_fetch_one_versioned(db_session, calculations):
+    row, version, updated_at = Calculation.fetch_one_versioned(db_session, calculations[1].id)
+    assert row == {"id": calculations[1].id, "a": 1.0, "b": 2.0, "type": "Add", "result": 3.0}
+    assert (version, updated_at) == (calculations[1].version, calculations[1].updated_at)
+    assert Calculation.fetch_one_versioned(db_session, -1) is None
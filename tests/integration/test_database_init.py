@@ -0,0 +1,69 @@
+# tests/integration/test_database_init.py
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.database_init import upgrade_db
+from app.models.calculation import Calculation
+from tests.conftest import test_engine
+
+pytestmark = pytest.mark.usefixtures("ensure_tables")
+
+def test_upgrade_adds_and_backfills_calculation_columns(db_session):
+    """A calculations table from before versioning gets the columns, filled in."""
+    with test_engine.begin() as connection:
+        connection.execute(text(
+            "ALTER TABLE calculations DROP COLUMN version, DROP COLUMN created_at, DROP COLUMN updated_at"
+        ))
+        connection.execute(text("INSERT INTO calculations (a, b, type, result) VALUES (1, 2, 'Add', 3)"))
+
+    upgrade_db(test_engine)
+    upgrade_db(test_engine)  # idempotent
+
+    columns = {column["name"]: column for column in inspect(test_engine).get_columns("calculations")}
+    assert not any(columns[name]["nullable"] for name in ("version", "created_at", "updated_at"))
+    assert columns["created_at"]["default"] is None
+
+    row = Calculation.fetch_one_versioned(db_session, db_session.query(Calculation.id).scalar())
+    assert row[1] == 1 and row[2] is not None
+
+USER_COLUMNS = "id, first_name, last_name, email, username, password_hash, is_active, is_verified, created_at, updated_at"
+
+def insert_user(connection, email, username):
+    connection.execute(text(
+        f"INSERT INTO users ({USER_COLUMNS}) VALUES "
+        "(gen_random_uuid(), 'A', 'B', :email, :username, 'x', true, false, now(), now())"
+    ), {"email": email, "username": username})
+
+def lower_indexes():
+    return {index["name"] for index in inspect(test_engine).get_indexes("users")} & {
+        "ix_users_email_lower", "ix_users_username_lower"
+    }
+
+def test_upgrade_adds_case_insensitive_user_indexes(db_session):
+    """A users table from before the lower() indexes gets them."""
+    with test_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_users_email_lower, ix_users_username_lower"))
+        insert_user(connection, "Ann@example.com", "ann")
+    assert not lower_indexes()
+
+    upgrade_db(test_engine)
+    upgrade_db(test_engine)  # idempotent
+
+    assert lower_indexes() == {"ix_users_email_lower", "ix_users_username_lower"}
+
+def test_upgrade_refuses_users_that_differ_only_by_case(db_session):
+    """Case-only duplicates are reported and nothing is applied until they are resolved."""
+    with test_engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_users_email_lower, ix_users_username_lower"))
+        insert_user(connection, "Bob@example.com", "bob")
+        insert_user(connection, "bob@example.com", "Bob")
+
+    with pytest.raises(RuntimeError, match="email 'bob@example.com', username 'bob'"):
+        upgrade_db(test_engine)
+    assert not lower_indexes()
+
+    with test_engine.begin() as connection:
+        connection.execute(text("DELETE FROM users WHERE username = 'Bob'"))
+    upgrade_db(test_engine)
+    assert lower_indexes() == {"ix_users_email_lower", "ix_users_username_lower"}
@@ -63,7 +63,7 @@ def test_get_current_user_valid_token_existing_user(mock_db, mock_verify_token):
     assert user_response.created_at == sample_user.created_at
     assert user_response.updated_at == sample_user.updated_at
 
-    mock_verify_token.assert_called_once_with("validtoken")
+    mock_verify_token.assert_called_once_with("validtoken", mock_db)
     mock_db.query.assert_called_once_with(User)
     # Use ANY to ignore the specific BinaryExpression instance
     mock_db.query.return_value.filter.assert_called_once_with(ANY)
@@ -79,7 +79,7 @@ def test_get_current_user_invalid_token(mock_db, mock_verify_token):
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
 
-    mock_verify_token.assert_called_once_with("invalidtoken")
+    mock_verify_token.assert_called_once_with("invalidtoken", mock_db)
     mock_db.query.assert_not_called()
 
 # Test get_current_user with valid token but non-existent user
@@ -93,7 +93,7 @@ def test_get_current_user_valid_token_nonexistent_user(mock_db, mock_verify_toke
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
     assert exc_info.value.detail == "Could not validate credentials"
 
-    mock_verify_token.assert_called_once_with("validtoken")
+    mock_verify_token.assert_called_once_with("validtoken", mock_db)
     mock_db.query.assert_called_once_with(User)
     mock_db.query.return_value.filter.assert_called_once_with(ANY)
     mock_db.query.return_value.filter.return_value.first.assert_called_once()
@@ -0,0 +1,102 @@
+# tests/integration/test_gunicorn_conf.py
+
+import gc
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from types import SimpleNamespace
+
+import psutil
+import pytest
+
+import main
+from app import gunicorn_conf
+from app.memory_report import memory_report, worker_memory
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_serving(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health/live", timeout=1).read()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def test_split_warmup_steps_keeps_database_steps_for_workers():
+    split = gunicorn_conf.split_warmup_steps
+    assert split("pool, statements,schemas,bcrypt,tokens") == ("schemas,bcrypt,tokens", "pool,statements")
+    assert split("") == ("", "")
+
+
+def test_when_ready_warms_and_freezes_the_preloaded_app(monkeypatch):
+    from app import database  # the current module; some tests re-import it
+
+    monkeypatch.setattr(main.app.state, "settings", main.app.state.settings)
+    server = SimpleNamespace(
+        cfg=SimpleNamespace(preload_app=True),
+        app=SimpleNamespace(wsgi=lambda: main.app),
+        log=logging.getLogger("gunicorn.error"),
+    )
+    try:
+        gunicorn_conf.when_ready(server)
+        assert gc.get_freeze_count() > 0
+        assert main.app.state.settings.WARMUP_STEPS == "pool,statements"
+        assert database._engine is None
+    finally:
+        gc.unfreeze()
+
+
+def test_when_ready_leaves_app_alone_without_preload():
+    def no_app():
+        raise AssertionError("loaded the app in the master")
+
+    gunicorn_conf.when_ready(SimpleNamespace(cfg=SimpleNamespace(preload_app=False), app=SimpleNamespace(wsgi=no_app)))
+
+
+def test_worker_memory_reports_rss_and_uss():
+    [row] = worker_memory([os.getpid()])
+    assert row["pid"] == os.getpid()
+    assert row["rss_mb"] >= row["uss_mb"] > 0
+    assert worker_memory([2 ** 22 + 1]) == []  # gone processes are skipped
+
+
+def test_gunicorn_forks_preloaded_workers_and_stops_on_sigterm():
+    pytest.importorskip("gunicorn")
+    port = free_port()
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "main:app", "--preload", "-k", "uvicorn.workers.UvicornWorker",
+         "-c", "python:app.gunicorn_conf", "--bind", f"127.0.0.1:{port}", "--workers", "2"],
+        cwd=ROOT, env={**os.environ, "DB_ECHO": "false"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_serving(port)
+        workers = psutil.Process(master.pid).children()
+        assert len(workers) == 2
+        report = memory_report(master.pid)
+        assert all(f"worker {worker.pid}" in report for worker in workers)
+
+        master.send_signal(signal.SIGTERM)
+        assert master.wait(timeout=60) == 0
+        assert not any(worker.is_running() for worker in workers)
+    finally:
+        if master.poll() is None:
+            master.kill()
@@ -0,0 +1,82 @@
+# tests/integration/test_last_login_buffer.py
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from app.auth.last_login import LastLoginBuffer, last_login_buffer
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+pytestmark = pytest.mark.usefixtures("ensure_tables")
+
+@pytest.fixture
+def users(db_session):
+    """Register two users to log in with."""
+    created = []
+    for name in ("loginone", "logintwo"):
+        created.append(User.register(db_session, {
+            "first_name": "Login",
+            "last_name": "Buffer",
+            "email": f"{name}@example.com",
+            "username": name,
+            "password": "TestPass123"
+        }))
+    db_session.commit()
+    return created
+
+def test_authenticate_does_not_write_last_login(db_session, users):
+    """Login only queues the timestamp; the row is untouched until a flush."""
+    last_login_buffer.flush()
+    assert User.authenticate(db_session, "loginone", "TestPass123") is not None
+
+    db_session.refresh(users[0])
+    assert users[0].last_login is None
+    assert last_login_buffer.pending() == 1
+
+    assert last_login_buffer.flush() == 1
+    db_session.refresh(users[0])
+    assert users[0].last_login is not None
+
+def test_flush_batches_and_keeps_latest_timestamp(db_session, users):
+    """Repeated logins collapse; all users are written by one flush."""
+    buffer = LastLoginBuffer(session_factory=TestingSessionLocal)
+    earlier = datetime(2025, 1, 1, 12, 0, 0)
+    later = earlier + timedelta(minutes=5)
+
+    buffer.record(users[0].id, earlier)
+    buffer.record(users[0].id, later)
+    buffer.record(users[1].id, earlier)
+
+    assert buffer.flush() == 2
+    assert buffer.pending() == 0
+    db_session.refresh(users[0])
+    db_session.refresh(users[1])
+    assert users[0].last_login == later
+    assert users[1].last_login == earlier
+
+def test_background_flush_bounds_staleness(db_session, users):
+    """The flusher thread writes pending timestamps within the interval."""
+    buffer = LastLoginBuffer(flush_interval=0.05, session_factory=TestingSessionLocal)
+    buffer.start()
+    try:
+        buffer.record(users[0].id)
+        deadline = time.time() + 5
+        while buffer.pending() and time.time() < deadline:
+            time.sleep(0.01)
+        assert buffer.pending() == 0
+    finally:
+        buffer.stop()
+
+    db_session.refresh(users[0])
+    assert users[0].last_login is not None
+
+def test_stop_flushes_pending(db_session, users):
+    """Shutdown writes whatever is still queued."""
+    buffer = LastLoginBuffer(flush_interval=3600, session_factory=TestingSessionLocal)
+    buffer.start()
+    buffer.record(users[1].id)
+    buffer.stop()
+
+    db_session.refresh(users[1])
+    assert users[1].last_login is not None
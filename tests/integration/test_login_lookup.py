@@ -0,0 +1,77 @@
+# tests/integration/test_login_lookup.py
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from app.models.user import User
+
+pytestmark = pytest.mark.usefixtures("ensure_tables")
+
+@pytest.fixture
+def registered_user(db_session):
+    user = User.register(db_session, {
+        "first_name": "Lookup",
+        "last_name": "Tester",
+        "email": "Lookup.Tester@Example.com",
+        "username": "LookupUser",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+    return user
+
+def explain(db_session, identifier):
+    """Return the PostgreSQL plan for the login lookup of ``identifier``."""
+    stmt = User.login_lookup(identifier).compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+    # The table is tiny, so take sequential scans off the table to see
+    # which index the planner can use at all.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    rows = db_session.execute(text(f"EXPLAIN {stmt}")).scalars().all()
+    db_session.rollback()
+    return "\n".join(rows)
+
+@pytest.mark.parametrize("identifier, index_name", [
+    ("lookup.tester@example.com", "ix_users_email_lower"),
+    ("lookupuser", "ix_users_username_lower"),
+])
+def test_login_lookup_uses_single_functional_index(db_session, registered_user, identifier, index_name):
+    """Each lookup is an index scan on one lower() index, never a BitmapOr."""
+    plan = explain(db_session, identifier)
+
+    assert index_name in plan
+    assert "BitmapOr" not in plan
+    assert "Seq Scan" not in plan
+
+@pytest.mark.parametrize("identifier", [
+    "LOOKUPUSER",
+    "lookup.tester@EXAMPLE.com",
+])
+def test_authenticate_is_case_insensitive(db_session, registered_user, identifier):
+    """Username and email logins ignore case."""
+    assert User.authenticate(db_session, identifier, "TestPass123") is not None
+
+def test_authenticate_username_containing_at_sign(db_session):
+    """An '@' in a username still finds the user via the username index."""
+    User.register(db_session, {
+        "first_name": "At",
+        "last_name": "Sign",
+        "email": "at.sign@example.com",
+        "username": "at@sign",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+
+    assert User.authenticate(db_session, "at@sign", "TestPass123") is not None
+
+def test_register_rejects_case_variant_duplicates(db_session, registered_user):
+    """The lower() unique indexes make uniqueness case-insensitive."""
+    with pytest.raises(ValueError, match="Username or email already exists"):
+        User.register(db_session, {
+            "first_name": "Lookup",
+            "last_name": "Tester",
+            "email": "other@example.com",
+            "username": "lookupuser",
+            "password": "TestPass123"
+        })
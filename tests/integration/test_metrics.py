@@ -0,0 +1,107 @@
+# tests/integration/test_metrics.py
+
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY, CollectorRegistry
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import create_engine
+
+from app.config import settings
+from app.metrics import cache_hit, cache_miss, instrument_engine, uninstrument_engine
+from app.models.user import User
+from app.routing import InstrumentedRoute
+from main import app
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_route_metrics_use_route_template():
+    client = TestClient(app)
+    before = sample("http_requests_total", method="POST", route="/add", status="200")
+
+    assert client.post("/add", json={"a": 1, "b": 2}).status_code == 200
+    assert client.post("/add", json={"a": "x"}).status_code == 400
+
+    assert sample("http_requests_total", method="POST", route="/add", status="200") == before + 1
+    assert sample("http_requests_total", method="POST", route="/add", status="400") >= 1
+    assert sample("http_request_duration_seconds_count", method="POST", route="/add") >= 2
+    assert sample("http_requests_in_progress", method="POST", route="/add") == 0
+
+
+def test_metrics_endpoint_exposes_prometheus_text():
+    client = TestClient(app)
+    client.post("/divide", json={"a": 1, "b": 0})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="POST",route="/divide",status="400"}' in response.text
+    assert "db_pool_connections_checked_out" in response.text
+
+
+def test_cache_and_bcrypt_metrics():
+    hits = sample("cache_requests_total", cache="test", result="hit")
+    cache_hit("test")
+    cache_miss("test")
+    assert sample("cache_requests_total", cache="test", result="hit") == hits + 1
+    assert sample("cache_requests_total", cache="test", result="miss") >= 1
+
+    hashes = sample("bcrypt_duration_seconds_count", operation="hash")
+    User.hash_password("SecurePass123")
+    assert sample("bcrypt_duration_seconds_count", operation="hash") == hashes + 1
+    assert sample("bcrypt_operations_in_progress") == 0
+
+
+def test_pool_checkout_gauge():
+    engine = create_engine(settings.DATABASE_URL, pool_size=2, max_overflow=1)
+    capacity = sample("db_pool_capacity")
+    instrument_engine(engine)
+    assert sample("db_pool_capacity") == capacity + 3
+
+    checked_out = sample("db_pool_connections_checked_out")
+    with engine.connect():
+        assert sample("db_pool_connections_checked_out") == checked_out + 1
+    assert sample("db_pool_connections_checked_out") == checked_out
+
+    uninstrument_engine(engine)
+    engine.dispose()
+
+
+def test_metrics_disabled_leaves_handler_unwrapped(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    router = APIRouter(route_class=InstrumentedRoute)
+
+    @router.get("/uninstrumented")
+    def uninstrumented():
+        return {}
+
+    bare = FastAPI()
+    bare.include_router(router)
+    TestClient(bare).get("/uninstrumented")
+    assert sample("http_requests_total", method="GET", route="/uninstrumented", status="200") == 0
+
+
+def test_counts_aggregate_across_processes(tmp_path):
+    """Each worker writes its own file; the collector sums them."""
+    increment = (
+        "import app.metrics as m; "
+        "m.REQUESTS.labels('GET', '/calculations', '200').inc(3)"
+    )
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, "-c", increment], cwd=ROOT, check=True,
+            env={"PATH": "", "METRICS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": str(ROOT)},
+        )
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=str(tmp_path))
+    labels = {"method": "GET", "route": "/calculations", "status": "200"}
+    assert registry.get_sample_value("http_requests_total", labels) == 6
@@ -0,0 +1,103 @@
+# tests/integration/test_msgpack_negotiation.py
+
+import msgpack
+import pytest
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from main import app
+from app.database import get_db
+from app.negotiation import wants_msgpack
+from tests.conftest import TestingSessionLocal
+
+MSGPACK = "application/msgpack"
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables, auth_headers):
+    """Test client bound to the PostgreSQL test database."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app, headers=auth_headers)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+def post_msgpack(client, url, payload, accept=MSGPACK):
+    return client.post(
+        url,
+        content=msgpack.packb(payload),
+        headers={"Content-Type": MSGPACK, "Accept": accept},
+    )
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, False),
+    ("*/*", False),
+    ("application/json", False),
+    ("application/msgpack", True),
+    ("application/x-msgpack", True),
+    ("application/json, application/msgpack", False),
+    ("application/json;q=0.5, application/msgpack", True),
+    ("application/msgpack;q=0", False),
+])
+def test_wants_msgpack(accept, expected):
+    headers = [(b"accept", accept.encode())] if accept else []
+    request = Request({"type": "http", "headers": headers})
+    assert wants_msgpack(request) is expected
+
+@pytest.mark.parametrize("url, expected", [
+    ("/add", 5.0),
+    ("/subtract", -1.0),
+    ("/multiply", 6.0),
+    ("/divide", 2 / 3),
+])
+def test_calculator_msgpack_round_trip(client, url, expected):
+    response = post_msgpack(client, url, {"a": 2, "b": 3})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == MSGPACK
+    assert msgpack.unpackb(response.content) == {"result": expected}
+
+def test_msgpack_body_with_json_response(client):
+    """A MessagePack request can still ask for a JSON response."""
+    response = post_msgpack(client, "/add", {"a": 2, "b": 3}, accept="application/json")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"result": 5.0}
+
+def test_json_stays_default(client):
+    response = client.post("/add", json={"a": 2, "b": 3})
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == {"result": 5.0}
+
+def test_msgpack_body_is_validated(client):
+    response = post_msgpack(client, "/add", {"a": "not a number", "b": 3})
+    assert response.status_code == 400
+
+def test_invalid_msgpack_body(client):
+    response = client.post("/add", content=b"\xc1", headers={"Content-Type": MSGPACK})
+    assert response.status_code == 400
+
+def test_calculations_bread_over_msgpack(client, db_session):
+    created = post_msgpack(client, "/calculations", {"a": 4, "b": 2, "type": "Divide"})
+    assert created.status_code == 201
+    body = msgpack.unpackb(created.content)
+    assert body["result"] == 2.0
+
+    read = client.get(f"/calculations/{body['id']}", headers={"Accept": MSGPACK})
+    assert msgpack.unpackb(read.content) == body
+
+    page = client.get("/calculations", headers={"Accept": MSGPACK})
+    assert msgpack.unpackb(page.content) == [body]
+
+    edited = client.put(
+        f"/calculations/{body['id']}",
+        content=msgpack.packb({"b": 4}),
+        headers={"Content-Type": MSGPACK, "Accept": MSGPACK},
+    )
+    assert msgpack.unpackb(edited.content)["result"] == 1.0
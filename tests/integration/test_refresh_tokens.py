@@ -0,0 +1,164 @@
+# tests/integration/test_refresh_tokens.py
+
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.auth.refresh_tokens import RefreshTokenBuffer, refresh_token_buffer
+from app.database import get_db
+from app.models.refresh_token import RefreshToken, hash_refresh_token
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables):
+    """Test client bound to the PostgreSQL test database."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+@pytest.fixture
+def tokens(client, db_session):
+    """Register a user and log in, returning the token response."""
+    User.register(db_session, {
+        "first_name": "Refresh",
+        "last_name": "Tester",
+        "email": "refresh@example.com",
+        "username": "refreshuser",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+    refresh_token_buffer.flush()  # tokens queued by earlier tests' logins
+
+    response = client.post("/users/login", json={"username": "refreshuser", "password": "TestPass123"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_login_returns_refresh_token(tokens, db_session):
+    """Login issues a refresh token whose digest, not raw value, is stored."""
+    assert tokens["refresh_token"]
+    # Inserted behind the login request, not by it
+    assert db_session.query(RefreshToken).count() == 0
+    assert refresh_token_buffer.flush() == 1
+    stored = db_session.query(RefreshToken).one()
+    assert stored.token_hash == hash_refresh_token(tokens["refresh_token"])
+    assert stored.token_hash != tokens["refresh_token"]
+
+def test_refresh_rotates_token(client, tokens):
+    """A refresh returns a usable access token and a new refresh token."""
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refresh_token"] != tokens["refresh_token"]
+    assert data["user"]["username"] == "refreshuser"
+
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert me.status_code == 200
+
+def test_refresh_does_not_verify_password(client, tokens, monkeypatch):
+    """Refreshing never goes through bcrypt."""
+    def fail(*args, **kwargs):
+        raise AssertionError("password verification on refresh")
+    monkeypatch.setattr(User, "verify_password", fail)
+
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+
+def test_reused_refresh_token_revokes_family(client, tokens):
+    """Presenting a rotated token again invalidates the newer one as well."""
+    first = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    rotated = first.json()["refresh_token"]
+
+    reuse = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reuse.status_code == 401
+
+    after_reuse = client.post("/users/token/refresh", json={"refresh_token": rotated})
+    assert after_reuse.status_code == 401
+
+def test_revoke_refresh_token(client, tokens):
+    """A revoked refresh token can no longer be exchanged."""
+    response = client.post("/users/token/revoke", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 204
+
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+def test_unknown_refresh_token(client):
+    """Unknown tokens are rejected."""
+    response = client.post("/users/token/refresh", json={"refresh_token": "not-a-real-token"})
+    assert response.status_code == 401
+
+def test_refresh_right_after_login_flushes_pending_token(client, tokens):
+    """A token still queued for insert is written before it is rotated."""
+    assert refresh_token_buffer.is_pending(hash_refresh_token(tokens["refresh_token"]))
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    assert refresh_token_buffer.pending() == 0
+
+def test_refresh_during_background_flush_waits_for_commit(client, tokens, monkeypatch):
+    """A token in a batch that is being written counts as pending until it is committed."""
+    writing, release = threading.Event(), threading.Event()
+    write = refresh_token_buffer.write
+
+    def slow_write(db, batch):
+        write(db, batch)
+        writing.set()
+        assert release.wait(5)
+    monkeypatch.setattr(refresh_token_buffer, "write", slow_write)
+
+    flusher = threading.Thread(target=refresh_token_buffer.flush)
+    flusher.start()
+    assert writing.wait(5)
+    assert refresh_token_buffer.is_pending(hash_refresh_token(tokens["refresh_token"]))
+
+    responses = []
+    refresher = threading.Thread(target=lambda: responses.append(
+        client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    ))
+    refresher.start()
+    refresher.join(0.2)
+    assert refresher.is_alive()  # waiting for the running flush to commit
+
+    release.set()
+    flusher.join(5)
+    refresher.join(5)
+    assert responses[0].status_code == 200
+
+def test_buffer_skips_tokens_of_deleted_users(db_session, tokens):
+    """A user deleted before the flush does not fail the whole batch."""
+    refresh_token_buffer.flush()  # the login's own token
+    user = db_session.query(User).one()
+    gone = User.register(db_session, {
+        "first_name": "Gone",
+        "last_name": "User",
+        "email": "gone@example.com",
+        "username": "goneuser",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+
+    buffer = RefreshTokenBuffer(session_factory=TestingSessionLocal)
+    now = datetime.utcnow()
+    for token_hash, user_id in (("a" * 64, user.id), ("b" * 64, gone.id)):
+        buffer.put(token_hash, (uuid.uuid4(), user_id, uuid.uuid4(), now + timedelta(days=1), now))
+    db_session.delete(gone)
+    db_session.commit()
+
+    assert buffer.flush() == 2
+    stored = {row.token_hash for row in db_session.query(RefreshToken)}
+    assert "a" * 64 in stored
+    assert "b" * 64 not in stored
@@ -0,0 +1,128 @@
+# tests/integration/test_token_revocation.py
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from app.auth.revocation import TokenRevocationList, token_revocation_list
+from app.database import get_db
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+from tests.conftest import TestingSessionLocal
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture
+def client(ensure_tables):
+    """Test client bound to the PostgreSQL test database."""
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+
+@pytest.fixture
+def tokens(client, db_session):
+    """Register a user and log in, returning the token response."""
+    User.register(db_session, {
+        "first_name": "Revoke",
+        "last_name": "Tester",
+        "email": "revoke@example.com",
+        "username": "revokeuser",
+        "password": "TestPass123"
+    })
+    db_session.commit()
+    response = client.post("/users/login", json={"username": "revokeuser", "password": "TestPass123"})
+    return response.json()
+
+def bearer(tokens):
+    return {"Authorization": f"Bearer {tokens['access_token']}"}
+
+def test_access_tokens_carry_unique_jti():
+    first = User.decode_token(User.create_access_token({"sub": "x"}))
+    second = User.decode_token(User.create_access_token({"sub": "x"}))
+    assert first["jti"] and first["jti"] != second["jti"]
+
+def test_logout_revokes_access_token(client, tokens, db_session):
+    """After logout the same access token is rejected."""
+    assert client.get("/users/me", headers=bearer(tokens)).status_code == 200
+
+    response = client.post("/users/logout", headers=bearer(tokens))
+    assert response.status_code == 204
+
+    assert client.get("/users/me", headers=bearer(tokens)).status_code == 401
+    jti = User.decode_token(tokens["access_token"])["jti"]
+    assert db_session.get(RevokedToken, jti) is not None
+
+def test_logout_also_revokes_refresh_token(client, tokens):
+    response = client.post(
+        "/users/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=bearer(tokens),
+    )
+    assert response.status_code == 204
+
+    response = client.post("/users/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+def test_unrevoked_token_skips_database(client, tokens):
+    """A filter miss answers without a revoked_tokens lookup."""
+    before = token_revocation_list.db_checks
+    assert client.get("/users/me", headers=bearer(tokens)).status_code == 200
+    assert token_revocation_list.db_checks == before
+
+def test_incremental_refresh_picks_up_other_workers(db_session):
+    """A revocation written elsewhere reaches this worker's filter on refresh."""
+    worker = TokenRevocationList(rebuild_interval=3600, session_factory=TestingSessionLocal)
+    worker.refresh()
+    assert not worker.might_be_revoked("elsewhere")
+
+    db_session.add(RevokedToken(jti="elsewhere", expires_at=datetime.utcnow() + timedelta(minutes=5)))
+    db_session.commit()
+
+    worker.refresh()
+    assert worker.might_be_revoked("elsewhere")
+    assert worker.is_revoked("elsewhere", db_session)
+
+def test_rebuild_purges_expired_rows(db_session):
+    """A full rebuild deletes rows whose tokens have already expired."""
+    db_session.add(RevokedToken(jti="stale", expires_at=datetime.utcnow() - timedelta(minutes=1)))
+    db_session.add(RevokedToken(jti="live", expires_at=datetime.utcnow() + timedelta(minutes=5)))
+    db_session.commit()
+
+    worker = TokenRevocationList(rebuild_interval=0, session_factory=TestingSessionLocal)
+    worker.refresh()
+
+    assert db_session.get(RevokedToken, "stale") is None
+    assert worker.might_be_revoked("live")
+    assert not worker.is_revoked("stale", db_session)
+
+def test_first_refresh_does_not_rebuild(db_session):
+    """The rebuild schedule starts with the list, not with the host's uptime."""
+    db_session.add(RevokedToken(jti="stale", expires_at=datetime.utcnow() - timedelta(minutes=1)))
+    db_session.commit()
+
+    worker = TokenRevocationList(rebuild_interval=3600, session_factory=TestingSessionLocal)
+    worker.refresh()
+
+    assert db_session.get(RevokedToken, "stale") is not None
+
+def test_filter_hit_is_confirmed_with_the_callers_session(db_session):
+    """is_revoked looks the id up through the session it is given."""
+    def no_sessions():
+        raise AssertionError("opened its own session")
+
+    worker = TokenRevocationList(session_factory=no_sessions)
+    worker.revoke(db_session, "mine", datetime.utcnow() + timedelta(minutes=5))
+    db_session.commit()
+
+    assert worker.is_revoked("mine", db_session)
+    assert worker.db_checks == 1
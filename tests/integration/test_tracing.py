@@ -0,0 +1,168 @@
+# tests/integration/test_tracing.py
+
+import json
+import threading
+import uuid
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import main
+from app.config import settings
+from app.database import get_db
+from app.models.user import User
+from app.routing import InstrumentedRoute
+from app.tracing import OTLPJsonFileExporter, Tracer, parse_traceparent, tracer
+from tests.conftest import TestingSessionLocal
+
+PASSWORD = "TracePass123!"
+
+
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def traces(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "sample_rate", 1.0)
+    monkeypatch.setattr(tracer, "exporter", OTLPJsonFileExporter(str(path), service_name="test"))
+    yield path
+    tracer.exporter.shutdown()
+
+
+@pytest.fixture
+def client(ensure_tables, traces):
+    """Login and /users/me mounted on routes built while tracing is enabled."""
+    router = APIRouter(route_class=InstrumentedRoute)
+    router.add_api_route("/login/json", main.login_user_json, methods=["POST"])
+    router.add_api_route("/users/me", main.read_users_me, methods=["GET"])
+    app = FastAPI()
+    app.state.settings = settings.model_copy(update={"TRACING_ENABLED": True})
+    app.include_router(router)
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app)
+
+
+@pytest.fixture
+def user(db_session):
+    suffix = uuid.uuid4().hex[:8]
+    user = User(
+        first_name="Trace", last_name="User", email=f"trace{suffix}@example.com",
+        username=f"trace{suffix}", password_hash=User.hash_password(PASSWORD),
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def read_traces(path):
+    tracer.exporter.flush()
+    traces = []
+    for line in path.read_text().splitlines():
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        traces.append({span["name"]: span for span in spans})
+    return traces
+
+
+def test_login_phases_traced(user, client, traces):
+    response = client.post("/login/json", json={"username": user.username, "password": PASSWORD})
+    assert response.status_code == 200
+
+    [trace] = read_traces(traces)
+    root = trace["POST /login/json"]
+    assert root["kind"] == 2 and root["parentSpanId"] == ""
+    assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    for name in ("request.validate", "endpoint", "response.render"):
+        assert trace[name]["parentSpanId"] == root["spanId"]
+    endpoint = trace["endpoint"]["spanId"]
+    for name in ("db.user_lookup", "bcrypt.verify", "last_login.record", "refresh_token.issue",
+                 "validate.user_response", "jwt.encode", "serialize"):
+        assert trace[name]["parentSpanId"] == endpoint, name
+        assert trace[name]["traceId"] == root["traceId"]
+    assert int(trace["bcrypt.verify"]["startTimeUnixNano"]) >= int(trace["db.user_lookup"]["endTimeUnixNano"])
+
+
+def test_get_current_user_traced_under_validation(user, client, traces):
+    token = client.post("/login/json", json={"username": user.username, "password": PASSWORD}).json()["access_token"]
+    assert client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+
+    trace = read_traces(traces)[1]
+    validate = trace["request.validate"]["spanId"]
+    for name in ("jwt.verify", "db.user_lookup", "validate.user_response"):
+        assert trace[name]["parentSpanId"] == validate, name
+
+
+def test_traceparent_controls_sampling(user, client, traces, monkeypatch):
+    monkeypatch.setattr(tracer, "sample_rate", 0.0)
+    body = {"username": user.username, "password": PASSWORD}
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+
+    client.post("/login/json", json=body)
+    client.post("/login/json", json=body, headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-00"})
+    assert not traces.exists()
+
+    client.post("/login/json", json=body, headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+    [trace] = read_traces(traces)
+    assert trace["POST /login/json"]["traceId"] == trace_id
+    assert trace["POST /login/json"]["parentSpanId"] == "00f067aa0ba902b7"
+
+
+def test_export_is_queued_for_the_writer_thread(tmp_path, monkeypatch):
+    exporter = OTLPJsonFileExporter(str(tmp_path / "traces.jsonl"), queue_size=1)
+    written = []
+    writing, release = threading.Event(), threading.Event()
+
+    def slow_write(traces):
+        writing.set()
+        release.wait(5)
+        written.extend(traces)
+    monkeypatch.setattr(exporter, "_write", slow_write)
+    local = Tracer(enabled=True, sample_rate=1.0, exporter=exporter)
+    dropped = REGISTRY.get_sample_value("traces_dropped_total") or 0
+
+    with local.span("first"):
+        pass
+    assert writing.wait(5)
+    for name in ("second", "third"):
+        with local.span(name):
+            pass
+    # The writer is busy with "first"; "second" waits in the queue and "third" is dropped
+    assert REGISTRY.get_sample_value("traces_dropped_total") == dropped + 1
+    release.set()
+    exporter.shutdown()
+    assert [spans[0].name for spans in written] == ["first", "second"]
+
+
+def test_configure_builds_exporter_from_app_settings(tmp_path):
+    local = Tracer(enabled=False)
+    local.configure(settings.model_copy(update={
+        "TRACING_ENABLED": True, "TRACING_SAMPLE_RATE": 0.5,
+        "TRACING_EXPORT_PATH": str(tmp_path / "app.jsonl"), "TRACING_SERVICE_NAME": "app",
+    }))
+    assert local.enabled and local.sample_rate == 0.5
+    assert (local.exporter.path, local.exporter.service_name) == (str(tmp_path / "app.jsonl"), "app")
+
+    local.configure(settings.model_copy(update={"TRACING_ENABLED": False}))
+    assert not local.enabled and local.exporter is None
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    exporter = OTLPJsonFileExporter(str(tmp_path / "traces.jsonl"))
+    disabled = Tracer(enabled=False, exporter=exporter)
+    with disabled.request("GET /"):
+        with disabled.span("child") as span:
+            span.set_attribute("ignored", 1)
+    assert not (tmp_path / "traces.jsonl").exists()
+
+
+@pytest.mark.parametrize("value", [None, "", "garbage", "00-xyz-00f067aa0ba902b7-01", "00-abc-def-01"])
+def test_invalid_traceparent_ignored(value):
+    assert parse_traceparent(value) is None
@@ -5,6 +5,7 @@ from uuid import UUID
 import pydantic_core
 from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.auth.last_login import last_login_buffer
 
 def test_password_hashing(db_session, fake_user_data):
     """Test password hashing and verification functionality"""
@@ -96,6 +97,7 @@ def test_user_last_login_update(db_session, fake_user_data):
     # Authenticate and check last_login
     assert user.last_login is None
     auth_result = User.authenticate(db_session, fake_user_data['username'], "TestPass123")
+    last_login_buffer.flush()  # last_login is written behind the login request
     db_session.refresh(user)
     assert user.last_login is not None
 
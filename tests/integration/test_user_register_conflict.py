@@ -0,0 +1,54 @@
+# tests/integration/test_user_register_conflict.py
+
+import pytest
+from app.models.user import User
+
+pytestmark = pytest.mark.usefixtures("ensure_tables")
+
+def _user_data(**overrides):
+    data = {
+        "first_name": "Conflict",
+        "last_name": "Tester",
+        "email": "conflict@example.com",
+        "username": "conflictuser",
+        "password": "TestPass123"
+    }
+    data.update(overrides)
+    return data
+
+def test_register_returns_persistent_user(db_session):
+    """The INSERT ... RETURNING row is a usable ORM instance."""
+    user = User.register(db_session, _user_data())
+    db_session.commit()
+    db_session.refresh(user)
+
+    assert user.id is not None
+    assert user.created_at is not None
+    assert user.is_active is True
+    assert user.verify_password("TestPass123") is True
+
+@pytest.mark.parametrize("overrides", [
+    {"username": "otheruser"},                 # same email
+    {"email": "other@example.com"},            # same username
+])
+def test_register_conflict_maps_to_value_error(db_session, overrides):
+    """Either unique constraint conflicting maps to the existing error."""
+    User.register(db_session, _user_data())
+    db_session.commit()
+
+    with pytest.raises(ValueError, match="Username or email already exists"):
+        User.register(db_session, _user_data(**overrides))
+
+def test_register_conflict_keeps_transaction_usable(db_session):
+    """ON CONFLICT DO NOTHING does not abort the surrounding transaction."""
+    User.register(db_session, _user_data())
+    db_session.commit()
+
+    with pytest.raises(ValueError):
+        User.register(db_session, _user_data(username="otheruser"))
+
+    second = User.register(db_session, _user_data(username="second", email="second@example.com"))
+    db_session.commit()
+
+    assert db_session.query(User).count() == 2
+    assert second.username == "second"
@@ -0,0 +1,55 @@
+# tests/unit/test_blocking.py
+
+import asyncio
+import time
+
+from prometheus_client import REGISTRY
+
+from app.blocking import BlockingCallDetector
+from app.health import LoopLagMonitor
+
+
+async def slow_handler():
+    time.sleep(0.3)  # a sync call inside async def, like bcrypt or a DB query
+
+
+def test_detector_captures_stack_of_blocking_handler():
+    detector = BlockingCallDetector(threshold=0.05)
+
+    async def scenario():
+        detector.start()
+        await asyncio.sleep(0.05)
+        await slow_handler()
+        await asyncio.sleep(0.05)
+        detector.stop()
+
+    asyncio.run(scenario())
+
+    assert len(detector.reports) == 1
+    report = detector.reports[0]
+    assert report["location"] == "tests/unit/test_blocking.py:slow_handler"
+    assert report["stalled_ms"] > 50
+    assert "time.sleep(0.3)" in report["stack"]
+    assert REGISTRY.get_sample_value(
+        "blocking_calls_total", {"location": "tests/unit/test_blocking.py:slow_handler"}
+    ) >= 1
+
+
+def test_detector_quiet_when_loop_is_responsive():
+    detector = BlockingCallDetector(threshold=0.05)
+
+    async def scenario():
+        detector.start()
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+        detector.stop()
+
+    asyncio.run(scenario())
+    assert list(detector.reports) == []
+
+
+def test_loop_lag_samples_exported():
+    before = REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0
+    LoopLagMonitor().record(0.2)
+    assert REGISTRY.get_sample_value("event_loop_lag_seconds_count") == before + 1
+    assert REGISTRY.get_sample_value("event_loop_lag_last_seconds") == 0.2
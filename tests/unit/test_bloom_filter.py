@@ -0,0 +1,32 @@
+# tests/unit/test_bloom_filter.py
+
+import uuid
+
+from app.auth.revocation import BloomFilter
+
+
+def test_added_items_are_always_members():
+    """A Bloom filter never reports a false negative."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [uuid.uuid4().hex for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+
+
+def test_false_positive_rate_near_target():
+    """At capacity, unseen ids hit the filter at roughly the configured rate."""
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for _ in range(5000):
+        bloom.add(uuid.uuid4().hex)
+
+    probes = 20000
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(probes))
+    assert false_positives / probes < 0.03
+
+
+def test_empty_filter_contains_nothing():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    assert "anything" not in bloom
@@ -2,7 +2,7 @@
 
 import pytest
 from pydantic import ValidationError
-from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate
+from app.schemas.calculation import CalculationCreate, CalculationRead, CalculationUpdate, parse_fields
 
 class TestCalculationCreate:
     """Test CalculationCreate schema validation."""
@@ -162,4 +162,20 @@ class TestCalculationUpdate:
         assert calc.a is None
         assert calc.b is None
         assert calc.type is None
-        assert calc.result is None
\ No newline at end of file
+        assert calc.result is None
+
+
+class TestParseFields:
+    """Test parsing of the ``fields`` sparse field set parameter."""
+
+    def test_no_fields_means_all(self):
+        assert parse_fields(None) is None
+
+    def test_fields_put_in_response_order(self):
+        assert parse_fields("result, id,result") == ("id", "result")
+
+    def test_unknown_or_empty_fields_rejected(self):
+        with pytest.raises(ValueError, match="user_id"):
+            parse_fields("id,user_id")
+        with pytest.raises(ValueError):
+            parse_fields(" , ")
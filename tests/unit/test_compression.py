@@ -0,0 +1,132 @@
+# tests/unit/test_compression.py
+
+import gzip
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.compression import CompressionMiddleware, choose_encoding
+from main import app as main_app
+
+BODY = "calculator " * 200
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, deflate, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("*", "br"),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+def test_choose_encoding_without_brotli():
+    assert choose_encoding("br, gzip", brotli_available=False) == "gzip"
+    assert choose_encoding("br", brotli_available=False) is None
+
+
+def make_client(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/text")
+    def text():
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    @app.get("/unchanged")
+    def unchanged():
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/binary")
+    def binary():
+        return Response(BODY.encode(), media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY.encode(), BODY.encode()]), media_type="text/plain")
+
+    return TestClient(app), app
+
+
+def test_gzip_and_brotli_negotiated():
+    client, _ = make_client()
+
+    gz = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.headers["vary"] == "Accept-Encoding"
+    assert int(gz.headers["content-length"]) < len(BODY)
+    assert gz.text == BODY
+
+    br = client.get("/text", headers={"Accept-Encoding": "gzip, br"})
+    assert br.headers["content-encoding"] == "br"
+    assert br.text == BODY
+
+
+def test_compressed_etag_becomes_weak():
+    client, _ = make_client()
+    response = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["etag"] == 'W/"abc"'
+
+
+def test_etag_weak_on_304_and_small_bodies_when_coding_negotiated():
+    """The validator does not depend on whether this particular body was compressed."""
+    client, _ = make_client()
+    compressed = client.get("/text", headers={"Accept-Encoding": "gzip"})
+    unchanged = client.get("/unchanged", headers={"Accept-Encoding": "gzip"})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["etag"] == compressed.headers["etag"] == 'W/"abc"'
+
+    identity = client.get("/unchanged", headers={"Accept-Encoding": "identity"})
+    assert identity.headers["etag"] == '"abc"'
+
+
+def test_small_and_binary_bodies_not_compressed():
+    client, _ = make_client()
+    for path in ("/small", "/binary"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+
+    identity = client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+
+def test_compression_level_applied():
+    fast, _ = make_client(gzip_level=1)
+    best, _ = make_client(gzip_level=9)
+    fast_size = int(fast.get("/text", headers={"Accept-Encoding": "gzip"}).headers["content-length"])
+    best_size = int(best.get("/text", headers={"Accept-Encoding": "gzip"}).headers["content-length"])
+    assert best_size <= fast_size
+
+
+def test_streaming_response_compressed():
+    client, _ = make_client()
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == BODY * 2
+
+
+def test_raw_bytes_match_codec():
+    middleware = CompressionMiddleware(app=None)
+    data = BODY.encode()
+    assert gzip.decompress(middleware.compress(data, "gzip")) == data
+    assert brotli.decompress(middleware.compress(data, "br")) == data
+
+
+def test_template_pages_compressed():
+    client = TestClient(main_app)
+    response = client.get("/", headers={"Accept-Encoding": "br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert "<html" in response.text.lower()
@@ -0,0 +1,62 @@
+# tests/unit/test_import_time.py
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+# Cumulative budget for ``import main``; override on slow CI machines
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "3000"))
+
+
+def import_times(statement: str) -> dict:
+    """Run ``statement`` under ``python -X importtime`` and map module -> cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.fixture(scope="module")
+def main_import():
+    return import_times("import main, app.database as d; assert d._engine is None")
+
+
+def test_importing_app_creates_no_engine(main_import):
+    """The DB driver is only loaded once an engine is created, which import never does."""
+    assert "main" in main_import
+    assert "psycopg2" not in main_import
+
+
+def test_main_import_within_budget(main_import):
+    assert main_import["main"] / 1000 < IMPORT_BUDGET_MS
+
+
+def test_operations_import_stays_light():
+    times = import_times("import app.operations")
+    assert "sqlalchemy" not in times
+    assert "fastapi" not in times
+
+
+def test_auth_and_template_dependencies_deferred():
+    """Models and schemas load without passlib, jose, Jinja2 or email_validator."""
+    times = import_times("import app.models.user, app.schemas, app.models.calculation")
+    for heavy in ("passlib", "jose", "cryptography", "jinja2", "email_validator"):
+        assert heavy not in times, f"{heavy} imported eagerly"
+
+
+def test_main_defers_passlib_jose_and_jinja2(main_import):
+    # email_validator still arrives with fastapi.openapi.models
+    for heavy in ("passlib", "jose", "cryptography", "jinja2", "uvicorn"):
+        assert heavy not in main_import, f"{heavy} imported eagerly"
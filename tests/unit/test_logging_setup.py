@@ -0,0 +1,97 @@
+# tests/unit/test_logging_setup.py
+
+import io
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueListener
+
+from prometheus_client import REGISTRY
+
+from app.logging_setup import JsonFormatter, NonBlockingQueueHandler, RepeatedErrorSampler
+
+
+def make_record(msg="Login error: %s", args=("boom",), level=logging.ERROR, created=1000.0, **extra):
+    record = logging.makeLogRecord({
+        "name": "main", "msg": msg, "args": args, "levelno": level,
+        "levelname": logging.getLevelName(level), **extra,
+    })
+    record.created = created
+    return record
+
+
+def dropped(reason):
+    return REGISTRY.get_sample_value("log_records_dropped_total", {"reason": reason}) or 0
+
+
+def test_json_formatter_includes_extras_and_exception():
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = make_record(route="/users/login", exc_info=sys.exc_info())
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "main"
+    assert entry["message"] == "Login error: boom"
+    assert entry["route"] == "/users/login"
+    assert "ValueError: bad input" in entry["exception"]
+    assert entry["time"].endswith("+00:00")
+
+
+def test_sampler_limits_repeats_per_route_and_template():
+    sampler = RepeatedErrorSampler(window=10, burst=3)
+    before = dropped("sampled")
+
+    passed = [sampler.filter(make_record(args=(i,), route="/users/login", created=1000 + i * 0.01)) for i in range(10)]
+    assert passed == [True] * 3 + [False] * 7
+    assert dropped("sampled") == before + 7
+
+    # Other routes, other templates and info records are separate or unsampled
+    assert sampler.filter(make_record(route="/calculations"))
+    assert sampler.filter(make_record(msg="Logout error: %s", route="/users/login"))
+    assert sampler.filter(make_record(level=logging.INFO, route="/users/login"))
+
+    record = make_record(route="/users/login", created=1011)
+    assert sampler.filter(record)
+    assert record.suppressed == 7
+
+
+def test_queue_handler_defers_formatting_and_never_blocks():
+    records = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(records, maxsize=1)
+    before = dropped("queue_full")
+
+    handler.handle(make_record())
+    handler.handle(make_record())  # queue full: dropped, not raised or waited on
+
+    queued = records.get_nowait()
+    assert queued.msg == "Login error: %s" and queued.args == ("boom",)
+    assert dropped("queue_full") == before + 1
+
+
+def test_error_storm_writes_sampled_json_lines():
+    output = io.StringIO()
+    writer = logging.StreamHandler(output)
+    writer.setFormatter(JsonFormatter())
+    records = queue.SimpleQueue()
+    handler = NonBlockingQueueHandler(records)
+    handler.addFilter(RepeatedErrorSampler(window=60, burst=5))
+    listener = QueueListener(records, writer)
+
+    logger = logging.getLogger("tests.storm")
+    logger.propagate = False
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        for i in range(200):
+            logger.error("HTTPException on %s: %s", f"/calculations/{i}", "Not found", extra={"route": "/calculations/{id}"})
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["message"] == "HTTPException on /calculations/0: Not found"
+    assert lines[0]["route"] == "/calculations/{id}"
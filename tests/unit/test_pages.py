@@ -0,0 +1,106 @@
+# tests/unit/test_pages.py
+
+import gzip
+import os
+
+import brotli
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.pages import PageCache
+from main import create_app
+
+PAGE = "<html><body>" + "<p>calculator</p>" * 100 + "</body></html>"
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    (tmp_path / "page.html").write_text(PAGE)
+    return tmp_path
+
+
+def make_client(cache):
+    app = FastAPI()
+
+    @app.get("/page")
+    async def page(request: Request):
+        return cache.response(request, "page.html")
+
+    return TestClient(app)
+
+
+def test_page_rendered_once(template_dir, monkeypatch):
+    cache = PageCache(directory=str(template_dir))
+    renders = []
+    original = cache._render
+    monkeypatch.setattr(cache, "_render", lambda *args: renders.append(args) or original(*args))
+
+    client = make_client(cache)
+    for _ in range(3):
+        assert client.get("/page").text == PAGE
+    assert len(renders) == 1
+
+
+def test_precompressed_variants_served(template_dir):
+    cache = PageCache(directory=str(template_dir))
+    page = cache.get("page.html")
+    assert gzip.decompress(page.variants["gzip"]) == PAGE.encode()
+    assert brotli.decompress(page.variants["br"]) == PAGE.encode()
+
+    client = make_client(cache)
+    br = client.get("/page", headers={"Accept-Encoding": "br"})
+    gz = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/page", headers={"Accept-Encoding": "identity"})
+
+    assert br.headers["content-encoding"] == "br"
+    assert gz.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in identity.headers
+    assert br.text == gz.text == identity.text == PAGE
+    assert br.headers["etag"] == gz.headers["etag"] == f'W/{identity.headers["etag"]}'
+    assert identity.headers["cache-control"] == cache.cache_control
+    assert identity.headers["vary"] == "Accept-Encoding"
+
+
+def test_if_none_match_returns_304(template_dir):
+    client = make_client(PageCache(directory=str(template_dir)))
+    etag = client.get("/page", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    response = client.get("/page", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    assert response.headers["etag"] == etag
+
+    # Weak comparison: the brotli variant is the same page
+    other = client.get("/page", headers={"Accept-Encoding": "br", "If-None-Match": etag})
+    assert other.status_code == 304
+
+
+def test_auto_reload_rerenders_changed_template(template_dir):
+    cache = PageCache(directory=str(template_dir), auto_reload=True)
+    first = cache.get("page.html")
+
+    template = template_dir / "page.html"
+    template.write_text("<html>changed</html>")
+    os.utime(template, (first.mtime + 10, first.mtime + 10))
+
+    assert cache.get("page.html").body == b"<html>changed</html>"
+
+
+def test_no_reload_keeps_rendered_bytes(template_dir):
+    cache = PageCache(directory=str(template_dir), auto_reload=False)
+    first = cache.get("page.html")
+    (template_dir / "page.html").write_text("<html>changed</html>")
+    assert cache.get("page.html") is first
+
+
+def test_template_routes_serve_cached_pages():
+    client = TestClient(create_app())
+    for path, name in (("/", "index.html"), ("/register", "register.html"), ("/login", "login.html")):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert "etag" in response.headers
+        with open(os.path.join("templates", name)) as template:
+            assert response.text.strip() == template.read().strip()
@@ -0,0 +1,87 @@
+# tests/unit/test_profiling.py
+
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.profiling import ProfilingMiddleware, sign_profile_request, verify_profile_signature
+from main import create_app
+
+SECRET = "profiling-secret"
+
+
+def make_client(**kwargs):
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow_endpoint():
+        time.sleep(0.05)  # blocking work the profile should point at
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, **{"secret": SECRET, "interval": 0.001, **kwargs})
+    return TestClient(app)
+
+
+def profile_headers(path="/slow", secret=SECRET, **extra):
+    return {"X-Profile": "1", "X-Profile-Signature": sign_profile_request(secret, "GET", path), **extra}
+
+
+def test_signature_bound_to_route_and_expiry():
+    value = sign_profile_request(SECRET, "GET", "/slow")
+    assert verify_profile_signature(SECRET, "GET", "/slow", value)
+    assert not verify_profile_signature(SECRET, "GET", "/other", value)
+    assert not verify_profile_signature("other-secret", "GET", "/slow", value)
+    assert not verify_profile_signature(SECRET, "GET", "/slow", sign_profile_request(SECRET, "GET", "/slow", ttl=-1))
+    assert not verify_profile_signature(SECRET, "GET", "/slow", "garbage")
+
+
+def test_unsigned_request_is_not_profiled():
+    client = make_client()
+    for headers in ({}, {"X-Profile": "1"}, profile_headers(secret="wrong")):
+        response = client.get("/slow", headers=headers)
+        assert response.json() == {"ok": True}
+        assert "x-profile-id" not in response.headers
+
+
+def test_signed_request_returns_speedscope_profile():
+    response = make_client().get("/slow", headers=profile_headers())
+
+    assert response.status_code == 200
+    assert response.headers["x-profile-status"] == "200"
+    profile = response.json()
+    assert profile["profiles"][0]["type"] == "sampled"
+    frames = profile["shared"]["frames"]
+    samples = profile["profiles"][0]["samples"]
+    assert len(samples) == len(profile["profiles"][0]["weights"]) > 0
+    handler = next(i for i, frame in enumerate(frames) if frame["name"] == "slow_endpoint")
+    assert any(handler in sample for sample in samples)
+
+
+def test_collapsed_format():
+    response = make_client().get("/slow", headers=profile_headers(**{"X-Profile-Format": "collapsed"}))
+    assert response.headers["content-type"].startswith("text/plain")
+    lines = response.text.splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("slow_endpoint (test_profiling.py:" in line for line in lines)
+
+
+def test_profile_stored_when_output_dir_set(tmp_path):
+    response = make_client(output_dir=str(tmp_path)).get("/slow", headers=profile_headers())
+
+    assert response.json() == {"ok": True}
+    stored = tmp_path / f"{response.headers['x-profile-id']}.speedscope.json"
+    assert json.loads(stored.read_text())["name"] == "GET /slow"
+
+
+def test_profile_all_flag_needs_no_signature(tmp_path):
+    response = make_client(secret=None, profile_all=True, output_dir=str(tmp_path)).get("/slow")
+    assert "x-profile-id" in response.headers
+
+
+def test_middleware_not_installed_unless_configured():
+    assert not any(m.cls is ProfilingMiddleware for m in create_app(settings).user_middleware)
+    configured = create_app(settings.model_copy(update={"PROFILING_SECRET": SECRET}))
+    assert any(m.cls is ProfilingMiddleware for m in configured.user_middleware)
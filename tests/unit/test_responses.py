@@ -0,0 +1,47 @@
+# tests/unit/test_responses.py
+
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import fastapi.routing
+from fastapi.testclient import TestClient
+
+from app.responses import PydanticJSONResponse
+from app.schemas.calculation import CalculationRead
+from app.schemas.user import Token, UserResponse
+from main import app
+
+
+def test_renders_model_to_json_bytes():
+    calc = CalculationRead(id=1, a=2, b=3, type="Add", result=5)
+    response = PydanticJSONResponse(calc)
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == {"id": 1, "a": 2.0, "b": 3.0, "type": "Add", "result": 5.0}
+
+
+def test_renders_list_and_nested_models():
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    user = UserResponse(
+        id=uuid4(), username="johndoe", email="john@example.com", first_name="John",
+        last_name="Doe", is_active=True, is_verified=False, created_at=now, updated_at=now,
+    )
+    token = Token.model_construct(access_token="abc", refresh_token="def", token_type="bearer", user=user)
+
+    body = json.loads(PydanticJSONResponse([token]).body)
+
+    assert body[0]["user"]["id"] == str(user.id)
+    assert body[0]["user"]["created_at"] == "2025-01-01T12:00:00"
+
+
+def test_routes_skip_response_model_revalidation(monkeypatch):
+    """Handlers return bytes themselves, so FastAPI's serialize_response never runs."""
+    async def fail(*args, **kwargs):
+        raise AssertionError("response_model validation ran")
+    monkeypatch.setattr(fastapi.routing, "serialize_response", fail)
+
+    response = TestClient(app).post("/add", json={"a": 2, "b": 3})
+
+    assert response.status_code == 200
+    assert response.json() == {"result": 5.0}